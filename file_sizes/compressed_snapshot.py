@@ -0,0 +1,193 @@
+import struct
+
+import numpy as np
+
+import file_helper as fh
+
+MAGIC = b'FSZ1'
+HEADER = struct.Struct('<4sI')  # magic, block_size
+FOOTER = struct.Struct('<QQ4s')  # directory_offset, block_count, magic
+DEFAULT_BLOCK_SIZE = 64 * 1024
+MAX_VARINT_BYTES = 10
+
+# Заголовок блоку: де лежить, скільки значень і які в них мінімум, максимум та сума
+DIRECTORY_DTYPE = np.dtype([
+    ('offset', '<u8'),
+    ('length', '<u8'),
+    ('count', '<u8'),
+    ('min', '<i8'),
+    ('max', '<i8'),
+    ('sum', '<i8')
+])
+
+
+def encode_varints(numbers) -> np.ndarray:
+    """
+    Векторизоване кодування невід'ємних цілих у varint (LEB128): по 7 біт у байті,
+    старший біт означає, що число продовжується в наступному байті.
+    """
+    numbers = np.asarray(numbers, dtype=np.uint64)
+    byte_counts = np.ones(len(numbers), dtype=np.int64)
+    for position in range(1, MAX_VARINT_BYTES):
+        byte_counts += numbers >= (np.uint64(1) << np.uint64(7 * position))
+
+    starts = np.concatenate(([0], np.cumsum(byte_counts)[:-1]))
+    encoded = np.zeros(int(byte_counts.sum()), dtype=np.uint8)
+    for position in range(MAX_VARINT_BYTES):
+        selected = byte_counts > position
+        if not np.any(selected):
+            break
+        chunk = (numbers[selected] >> np.uint64(7 * position)) & np.uint64(0x7f)
+        more = (byte_counts[selected] > position + 1).astype(np.uint64) << np.uint64(7)
+        encoded[starts[selected] + position] = (chunk | more).astype(np.uint8)
+    return encoded
+
+
+def decode_varints(encoded) -> np.ndarray:
+    """Векторизоване декодування послідовності varint"""
+    encoded = np.asarray(encoded, dtype=np.uint8)
+    if len(encoded) == 0:
+        return np.empty(0, dtype=np.uint64)
+
+    ends = encoded < 0x80
+    value_ids = np.concatenate(([0], np.cumsum(ends)[:-1]))
+    value_starts = np.concatenate(([0], np.flatnonzero(ends)[:-1] + 1))
+    shifts = (7 * (np.arange(len(encoded)) - value_starts[value_ids])).astype(np.uint64)
+    parts = (encoded & 0x7f).astype(np.uint64) << shifts
+    return np.bitwise_or.reduceat(parts, value_starts)
+
+
+def write_compressed_snapshot(sorted_sizes, filename: str, block_size: int = DEFAULT_BLOCK_SIZE) -> int:
+    """
+    Записує відсортовані розміри у стиснутому форматі: блоки по block_size значень,
+    у кожному - різниці між сусідніми розмірами у varint. Наприкінці файлу - каталог
+    блоків з мінімумом, максимумом, кількістю та сумою кожного.
+
+    Args:
+        sorted_sizes (np.ndarray): Відсортовані розміри (можна np.memmap з external_sort)
+        filename (str): Шлях до стиснутого файлу
+        block_size (int): Кількість значень у блоці
+
+    Returns:
+        int: Кількість записаних блоків
+    """
+    directory = []
+    with open(filename, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, block_size))
+        offset = HEADER.size
+
+        for start in range(0, len(sorted_sizes), block_size):
+            block = np.asarray(sorted_sizes[start:start + block_size], dtype=np.int64)
+            if block[0] < 0:
+                raise ValueError("Розміри файлів мають бути невід'ємними")
+            if np.any(block[1:] < block[:-1]) or (directory and block[0] < directory[-1][4]):
+                raise ValueError("Розміри мають бути відсортовані")
+            deltas = np.diff(block, prepend=block[0]).astype(np.uint64)
+
+            payload = encode_varints(deltas)
+            file.write(payload.tobytes())
+            directory.append((offset, len(payload), len(block), block[0], block[-1], block.sum()))
+            offset += len(payload)
+
+        file.write(np.array(directory, dtype=DIRECTORY_DTYPE).tobytes())
+        file.write(FOOTER.pack(offset, len(directory), MAGIC))
+    return len(directory)
+
+
+class CompressedSnapshot:
+    """
+    Відкритий стиснутий знімок. У пам'ять читається лише каталог блоків;
+    самі блоки декодуються тоді, коли запит справді потребує їх вмісту.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.data = np.memmap(filename, dtype=np.uint8, mode='r')
+
+        magic, self.block_size = HEADER.unpack(self.data[:HEADER.size].tobytes())
+        directory_offset, block_count, footer_magic = FOOTER.unpack(self.data[-FOOTER.size:].tobytes())
+        if magic != MAGIC or footer_magic != MAGIC:
+            raise ValueError(f"{filename} не є стиснутим знімком")
+
+        directory_end = directory_offset + block_count * DIRECTORY_DTYPE.itemsize
+        self.directory = np.frombuffer(self.data[directory_offset:directory_end].tobytes(), dtype=DIRECTORY_DTYPE)
+        # Префіксні суми кількостей і обсягів на межах блоків
+        self.count_preffix = np.concatenate(([0], np.cumsum(self.directory['count']))).astype(np.int64)
+        self.bytes_preffix = np.concatenate(([0], np.cumsum(self.directory['sum']))).astype(np.int64)
+        self.file_count = int(self.count_preffix[-1])
+        self.total_size = int(self.bytes_preffix[-1])
+
+    def decode_block(self, index: int) -> np.ndarray:
+        entry = self.directory[index]
+        payload = self.data[int(entry['offset']):int(entry['offset'] + entry['length'])]
+        return entry['min'] + np.cumsum(decode_varints(payload).astype(np.int64))
+
+    def iter_blocks(self, start_block: int = 0, end_block: int = None):
+        """Потокове декодування: по одному блоку відсортованих розмірів за раз"""
+        end_block = len(self.directory) if end_block is None else end_block
+        for index in range(start_block, end_block):
+            yield self.decode_block(index)
+
+    def get_preffix_sum(self, position: int) -> int:
+        """Сумарний обсяг перших position файлів; декодується не більше одного блоку"""
+        position = min(max(position, 0), self.file_count)
+        block = int(np.searchsorted(self.count_preffix, position, side='right')) - 1
+        inside = position - int(self.count_preffix[block])
+        if inside == 0:
+            return int(self.bytes_preffix[block])
+        return int(self.bytes_preffix[block] + self.decode_block(block)[:inside].sum())
+
+    def get_sum(self, l: int, r: int) -> int:
+        """Аналог two_pointers_technique.get_sum: обсяг файлів з номерами [l, r] (з 1)"""
+        l = max(l, 1)
+        r = min(r, self.file_count)
+        return self.get_preffix_sum(r) - self.get_preffix_sum(l - 1)
+
+    def get_relative_sum(self, l: int, r: int) -> float:
+        """Аналог two_pointers_technique.get_relative_sum"""
+        return self.get_sum(l, r) / self.total_size
+
+    def get_size_at(self, position: int) -> int:
+        """Розмір файлу з номером position (з 0) у відсортованому порядку"""
+        block = int(np.searchsorted(self.count_preffix, position, side='right')) - 1
+        return int(self.decode_block(block)[position - int(self.count_preffix[block])])
+
+    def get_range(self, lower, upper) -> dict:
+        """
+        Кількість файлів і обсяг для розмірів у [lower, upper). Блоки, що повністю лежать
+        всередині або поза діапазоном, обробляються лише за каталогом без декодування.
+        """
+        minimums, maximums = self.directory['min'], self.directory['max']
+        inside = (minimums >= lower) & (maximums < upper)
+        partial = ~inside & (maximums >= lower) & (minimums < upper)
+
+        range_count = int(self.directory['count'][inside].sum())
+        range_bytes = int(self.directory['sum'][inside].sum())
+        for index in np.flatnonzero(partial):
+            block = self.decode_block(index)
+            selected = block[(block >= lower) & (block < upper)]
+            range_count += len(selected)
+            range_bytes += int(selected.sum())
+
+        return {
+            "count": range_count,
+            "bytes": range_bytes,
+            "count_share": range_count / self.file_count if self.file_count else 0,
+            "bytes_share": range_bytes / self.total_size if self.total_size else 0
+        }
+
+    def get_size_counts(self) -> tuple[np.ndarray, np.ndarray]:
+        """Потоково будує стиснуте представлення (унікальні розміри, кількості) для зважених аналізів"""
+        return fh.count_sorted_chunks(self.iter_blocks())
+
+
+if __name__ == "__main__":
+    import os
+    from external_sort import external_sort
+
+    sorted_sizes = external_sort(fh.STATS_FILENAME, "file_size_sys.sorted.bin")
+    write_compressed_snapshot(sorted_sizes, "file_size_sys.fsz")
+
+    snapshot = CompressedSnapshot("file_size_sys.fsz")
+    print(f"CSV: {os.path.getsize(fh.STATS_FILENAME)} байт, стиснутий знімок: {os.path.getsize('file_size_sys.fsz')} байт")
+    print(f"Файлів від 1 KB до 1 MB: {snapshot.get_range(1024, 1024 * 1024)}")
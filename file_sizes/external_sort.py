@@ -0,0 +1,168 @@
+import heapq
+import os
+import tempfile
+from array import array
+
+import numpy as np
+
+import file_helper as fh
+
+SIZE_DTYPE = np.int64
+ITEM_SIZE = np.dtype(SIZE_DTYPE).itemsize
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024  # 256 MB
+
+
+def write_sorted_run(sizes, run_filename: str):
+    """Сортує одну частину розмірів (array('q') або масив) і записує її на диск як int64"""
+    np.sort(np.asarray(sizes, dtype=SIZE_DTYPE), kind='stable').tofile(run_filename)
+
+
+def write_sorted_runs(sizes, run_dir: str, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> list[str]:
+    """
+    Перший етап зовнішнього сортування: ділить потік розмірів на частини,
+    що вміщуються у пам'ять, сортує кожну через NumPy і записує на диск як int64.
+
+    Args:
+        sizes (iterable): Потік розмірів файлів у байтах
+        run_dir (str): Каталог для тимчасових відсортованих частин
+        memory_budget (int): Скільки байтів пам'яті можна використати
+
+    Returns:
+        list: Шляхи до відсортованих частин
+    """
+    # Половина бюджету на буфер, половина на копію під час сортування
+    chunk_size = max(1024, memory_budget // (2 * ITEM_SIZE))
+    run_files = []
+    buffer = array('q')
+
+    def flush():
+        run_filename = os.path.join(run_dir, f"run_{len(run_files):05d}.bin")
+        write_sorted_run(buffer, run_filename)
+        run_files.append(run_filename)
+        del buffer[:]
+
+    for size in sizes:
+        buffer.append(size)
+        if len(buffer) >= chunk_size:
+            flush()
+    if len(buffer) > 0:
+        flush()
+
+    return run_files
+
+
+def merge_sorted_runs(run_files: list[str], output_filename: str, memory_budget: int = DEFAULT_MEMORY_BUDGET) -> int:
+    """
+    Другий етап: k-шляхове злиття відсортованих частин у один відсортований файл int64.
+    Купа впорядковує частини за останнім значенням у їх поточних буферах: усе, що не
+    перевищує мінімального з цих значень, можна безпечно злити і записати одним блоком.
+
+    Args:
+        run_files (list): Шляхи до відсортованих частин
+        output_filename (str): Шлях до результуючого файлу
+        memory_budget (int): Скільки байтів пам'яті можна використати
+
+    Returns:
+        int: Кількість записаних розмірів
+    """
+    # Буфер на кожну частину плюс стільки ж на блок виводу
+    block_size = max(1024, memory_budget // (2 * ITEM_SIZE * max(len(run_files), 1)))
+    runs = [np.memmap(run_filename, dtype=SIZE_DTYPE, mode='r') if os.path.getsize(run_filename) > 0
+            else np.empty(0, dtype=SIZE_DTYPE) for run_filename in run_files]
+    positions = [0] * len(runs)
+    buffers = [None] * len(runs)
+    heap = []
+
+    def refill(index):
+        start = positions[index]
+        buffers[index] = np.array(runs[index][start:start + block_size])
+        positions[index] = start + len(buffers[index])
+        if len(buffers[index]) > 0:
+            heapq.heappush(heap, (int(buffers[index][-1]), index))
+
+    for index in range(len(runs)):
+        refill(index)
+
+    written = 0
+    with open(output_filename, 'wb') as output:
+        while heap:
+            bound, _ = heap[0]
+
+            # Забираємо з кожного буфера все, що не більше за bound
+            parts = []
+            for index, buffer in enumerate(buffers):
+                if buffer is None or len(buffer) == 0:
+                    continue
+                cut = int(np.searchsorted(buffer, bound, side='right'))
+                if cut > 0:
+                    parts.append(buffer[:cut])
+                    buffers[index] = buffer[cut:]
+
+            block = np.sort(np.concatenate(parts), kind='stable')
+            block.tofile(output)
+            written += len(block)
+
+            # Частини, буфери яких вичерпано, дочитуємо з диска
+            while heap and len(buffers[heap[0][1]]) == 0:
+                _, index = heapq.heappop(heap)
+                refill(index)
+
+    return written
+
+
+def external_sort(sizes, output_filename: str, memory_budget: int = DEFAULT_MEMORY_BUDGET, tmp_dir: str = None) -> np.memmap:
+    """
+    Зовнішнє сортування розмірів файлів, які не вміщуються в оперативну пам'ять.
+
+    Args:
+        sizes (iterable | str): Потік розмірів або шлях до CSV-файлу статистики
+        output_filename (str): Шлях до відсортованого файлу int64
+        memory_budget (int): Скільки байтів пам'яті можна використати
+        tmp_dir (str): Каталог для тимчасових частин (за замовчуванням - поруч з output_filename)
+
+    Returns:
+        np.memmap: Відсортовані розміри, відображені у пам'ять
+    """
+    if isinstance(sizes, str):
+        sizes = fh.iter_sizes(sizes)
+    tmp_dir = tmp_dir or os.path.dirname(os.path.abspath(output_filename))
+
+    with tempfile.TemporaryDirectory(dir=tmp_dir, prefix="size_runs_") as run_dir:
+        run_files = write_sorted_runs(sizes, run_dir, memory_budget)
+        merge_sorted_runs(run_files, output_filename, memory_budget)
+
+    return open_sorted_sizes(output_filename)
+
+
+def open_sorted_sizes(filename: str) -> np.ndarray:
+    """Відкриває відсортований файл int64 як масив у пам'яті лише для читання"""
+    if os.path.getsize(filename) == 0:
+        return np.empty(0, dtype=SIZE_DTYPE)
+    return np.memmap(filename, dtype=SIZE_DTYPE, mode='r')
+
+
+def get_sorted_percentile(sorted_sizes, percent: float) -> float:
+    """Перцентиль з лінійною інтерполяцією (як np.percentile) без повного читання файлу"""
+    position = percent / 100 * (len(sorted_sizes) - 1)
+    lower = int(np.floor(position))
+    upper = min(lower + 1, len(sorted_sizes) - 1)
+    return float(sorted_sizes[lower] + (sorted_sizes[upper] - sorted_sizes[lower]) * (position - lower))
+
+
+def get_size_counts_from_sorted(sorted_sizes, chunk_size: int = 16 * 1024 * 1024) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Будує стиснуте представлення (унікальні розміри, кількості) з відсортованого файлу,
+    читаючи його блоками. Результат напряму приймають зважені пошуки інтервалів
+    у two_pointers_technique / two_pointers_for_quantity та stats.get_weighted_file_statistics.
+    """
+    chunks = (sorted_sizes[start:start + chunk_size] for start in range(0, len(sorted_sizes), chunk_size))
+    values, counts = fh.count_sorted_chunks(chunks)
+    return values.astype(SIZE_DTYPE), counts
+
+
+if __name__ == "__main__":
+    import stats
+
+    sorted_sizes = external_sort(fh.STATS_FILENAME, "file_size_sys.sorted.bin")
+    print(f"Відсортовано {len(sorted_sizes)} розмірів, медіана: {get_sorted_percentile(sorted_sizes, 50)}")
+    stats.print_file_statistics(stats.get_weighted_file_statistics(*get_size_counts_from_sorted(sorted_sizes)))
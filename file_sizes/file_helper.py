@@ -1,3 +1,12 @@
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+DEFAULT_WORKERS = os.cpu_count() or 1
+PARALLEL_MIN_LENGTH = 1 << 18  # менші масиви швидше обробити в одному потоці
+
 def try_parse_as_int(input: str):
     try:
         number = int(input)
@@ -5,16 +14,109 @@ def try_parse_as_int(input: str):
     except:
         return (False, 0);
 
-def get_sizes(filename: str) -> list[int]:
-    size_list = []
+def iter_sizes(filename: str):
+    """Послідовно повертає розміри з файлу статистики, не зберігаючи їх у пам'яті"""
     with open(filename) as file:
 
         for line in file:
-            size = try_parse_as_int(line.split(",")[1])
+            size = try_parse_as_int(line.rsplit(",", 1)[-1])
             if size[0]:
-                size_list.append(size[1])
+                yield size[1]
+
+def iter_timed_records(filename: str):
+    """
+    Послідовно повертає (розмір, mtime, atime) з файлу "path,mtime,atime,size".
+    Шлях може містити коми, тож поля відокремлюються з кінця рядка.
+    """
+    with open(filename) as file:
+
+        for line in file:
+            fields = line.rsplit(",", 3)
+            try:
+                yield int(fields[3]), float(fields[1]), float(fields[2])
+            except (ValueError, IndexError):
+                continue
+
+def get_sizes(filename: str) -> list[int]:
+    return list(iter_sizes(filename))
+
+def compress_sizes(input_list, workers: int = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Стискає список розмірів у пару (відсортовані унікальні розміри, кількості).
+    
+    Args:
+        input_list (list): Список розмірів файлів у байтах
+        workers (int): Кількість потоків (за замовчуванням - кількість ядер, 1 - без потоків)
+    """
+    sizes = np.asarray(input_list, dtype=np.int64)
+    workers = DEFAULT_WORKERS if workers is None else workers
+    if workers <= 1 or len(sizes) < PARALLEL_MIN_LENGTH:
+        values, counts = np.unique(sizes, return_counts=True)
+        return values, counts.astype(np.int64)
+    
+    with ThreadPoolExecutor(workers) as pool:
+        # 1. Кожен потік сортує свою частину масиву (сортування NumPy відпускає GIL)
+        runs = list(pool.map(np.sort, np.array_split(sizes, workers)))
+        
+        # 2. Межі діапазонів значень - квантилі вибірки з відсортованих частин
+        sample = np.sort(np.concatenate([run[np.linspace(0, len(run) - 1, 64 * workers).astype(np.int64)]
+                                         for run in runs]))
+        splitters = np.unique(sample[(np.arange(1, workers) * len(sample)) // workers])
+        cuts = [np.concatenate(([0], np.searchsorted(run, splitters, side='left'), [len(run)])) for run in runs]
+        
+        # 3. Кожен потік зливає свій діапазон з усіх частин; діапазони не перетинаються,
+        #    тож результати просто з'єднуються
+        def merge_range(index):
+            merged = np.sort(np.concatenate([run[cut[index]:cut[index + 1]] for run, cut in zip(runs, cuts)]),
+                             kind='stable')  # timsort: злиття вже відсортованих відрізків
+            return count_sorted_sizes(merged)
+        parts = list(pool.map(merge_range, range(len(splitters) + 1)))
+    
+    return (np.concatenate([part[0] for part in parts]).astype(np.int64),
+            np.concatenate([part[1] for part in parts]).astype(np.int64))
+
+def count_sorted_sizes(sorted_sizes) -> tuple[np.ndarray, np.ndarray]:
+    """Стиснуте представлення для вже відсортованого масиву - за один лінійний прохід"""
+    if len(sorted_sizes) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    starts = np.flatnonzero(np.concatenate(([True], sorted_sizes[1:] != sorted_sizes[:-1])))
+    return sorted_sizes[starts], np.diff(np.append(starts, len(sorted_sizes)))
+
+def count_sorted_chunks(chunks) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Стиснуте представлення для відсортованих даних, що читаються блоками (memmap, знімок):
+    count_sorted_sizes по кожному блоку, а група однакових розмірів на межі блоків
+    зливається з попередньою.
+    """
+    values_parts, counts_parts = [], []
+    for chunk in chunks:
+        values, counts = count_sorted_sizes(np.asarray(chunk))
+        if len(values) == 0:
+            continue
+        if values_parts and values_parts[-1][-1] == values[0]:
+            counts_parts[-1][-1] += counts[0]
+            values, counts = values[1:], counts[1:]
+        if len(values) > 0:
+            values_parts.append(values)
+            counts_parts.append(counts.astype(np.int64))
+
+    if not values_parts:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(values_parts), np.concatenate(counts_parts)
+
+def get_size_counts(filename: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Читає файл зі статистикою одразу у стиснутому вигляді (унікальні розміри, кількості),
+    не створюючи список з одним елементом на кожен файл.
+    """
+    counter = Counter(iter_sizes(filename))
+    values = np.array(sorted(counter), dtype=np.int64)
+    counts = np.array([counter[value] for value in values.tolist()], dtype=np.int64)
+    return values, counts
 
-    return size_list
+def expand_sizes(values, counts) -> np.ndarray:
+    """Відновлює відсортований масив розмірів із стиснутого представлення"""
+    return np.repeat(values, counts)
 
 
-STATS_FILENAME = "OS_lab_1/file_size_sys.csv"
\ No newline at end of file
+STATS_FILENAME = "OS_lab_1/file_size_sys.csv"
@@ -2,12 +2,11 @@ import file_helper as fh
 from matplotlib import pyplot as plt
 import numpy as np
 
-# Отримання розмірів файлів
-size_list = fh.get_sizes(fh.STATS_FILENAME)
-size_list.sort()
+# Отримання розмірів файлів (унікальні розміри та їх кількості)
+size_values, size_counts = fh.get_size_counts(fh.STATS_FILENAME)
 
 # Загальний розмір файлів
-total_size = sum(size_list)
+total_size = int((size_values * size_counts).sum())
 # print(total_size, size_list[0], size_list[-1])
 
 # Побудова гістограми
@@ -16,9 +15,9 @@ plt.xscale('log')
 plt.yscale('log')  # Важливо, щоб частки від загального обсягу теж відображались логарифмічно
 
 # Використання логарифмічних бінів для рівномірнішого відображення
-bins = np.logspace(np.log10(max(min(size_list), 1)), np.log10(max(size_list)), num=100)
+bins = np.logspace(np.log10(max(size_values[0], 1)), np.log10(size_values[-1]), num=100)
 
-plt.hist(size_list, bins=bins, edgecolor='black')
+plt.hist(size_values, bins=bins, weights=size_counts, edgecolor='black')
 
 plt.xlabel("Розмір файлів (байти)")
 plt.ylabel("Кількість файлів")
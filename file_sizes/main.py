@@ -3,7 +3,7 @@ import file_helper as fh
 import two_pointers_technique as tp
 import majority_graph as maj
 import logarithmic_histogram as log_hist
-input_list = fh.get_sizes("file_size_sys.csv")
-# maj.save_visualizations(input_list)
-# print(tp.get_answer(input_list, 0.9))
-stats.analyze_file_sizes(input_list)
\ No newline at end of file
+size_values, size_counts = fh.get_size_counts("file_size_sys.csv")
+# maj.save_visualizations(fh.expand_sizes(size_values, size_counts).tolist())
+# print(tp.get_weighted_answer(size_values, size_counts, 0.9))
+stats.analyze_weighted_file_sizes(size_values, size_counts)
\ No newline at end of file
@@ -1,14 +1,16 @@
 import file_helper as fh
 from matplotlib import pyplot as plt
-from two_pointers_for_quantity import get_interval_with_min_borders as get_min
+from two_pointers_for_quantity import get_weighted_interval_with_min_borders as get_min
 import numpy as np
 
-# Отримання розмірів файлів
-size_list = fh.get_sizes(fh.STATS_FILENAME)
-size_list.sort()
+# Отримання розмірів файлів (унікальні розміри та їх кількості)
+size_values, size_counts = fh.get_size_counts(fh.STATS_FILENAME)
+count_preffix = np.concatenate(([0], np.cumsum(size_counts)))
 
-# Знаходження інтервалу
-interval_start, interval_end = get_min(size_list)
+# Знаходження інтервалу (номери файлів з 1) і відповідних груп унікальних розмірів
+interval_start, interval_end = get_min(size_values, size_counts)
+start_group = np.searchsorted(count_preffix, interval_start, side='left') - 1
+end_group = np.searchsorted(count_preffix, interval_end, side='left') - 1
 
 # Побудова гістограми
 plt.figure(figsize=(15, 8))
@@ -16,17 +18,18 @@ plt.xscale('log')
 plt.yscale('log')
 
 # Використання логарифмічних бінів для рівномірнішого відображення
-bins = np.logspace(np.log10(max(min(size_list), 1)), np.log10(max(size_list)), num=100)
+bins = np.logspace(np.log10(max(size_values[0], 1)), np.log10(size_values[-1]), num=100)
 
-# Створення масивів для розділення кольорів
-sizes_before = size_list[:interval_start]
-sizes_interval = size_list[interval_start:interval_end+1]
-sizes_after = size_list[interval_end+1:]
+# Кількості файлів кожного розміру до, всередині та після інтервалу
+# (група на межі інтервалу може бути розділена між сусідніми частинами)
+files_before = np.clip(interval_start - 1 - count_preffix[:-1], 0, size_counts)
+files_after = np.clip(count_preffix[1:] - interval_end, 0, size_counts)
+files_interval = size_counts - files_before - files_after
 
 # Побудова гістограм різними кольорами
-plt.hist(sizes_before, bins=bins, edgecolor='black', color='lightblue', alpha=0.7, label='До основного інтервалу')
-plt.hist(sizes_interval, bins=bins, edgecolor='black', color='red', alpha=0.7, label='Основний інтервал')
-plt.hist(sizes_after, bins=bins, edgecolor='black', color='lightgreen', alpha=0.7, label='Після основного інтервалу')
+plt.hist(size_values, bins=bins, weights=files_before, edgecolor='black', color='lightblue', alpha=0.7, label='До основного інтервалу')
+plt.hist(size_values, bins=bins, weights=files_interval, edgecolor='black', color='red', alpha=0.7, label='Основний інтервал')
+plt.hist(size_values, bins=bins, weights=files_after, edgecolor='black', color='lightgreen', alpha=0.7, label='Після основного інтервалу')
 
 plt.xlabel("Розмір файлів (байти)")
 plt.ylabel("Кількість файлів")
@@ -35,9 +38,9 @@ plt.grid(True, which="both", linestyle="--", linewidth=0.5)
 plt.legend()
 
 # Додаткова інформація про інтервал
-print(f"Основний інтервал: від {size_list[interval_start]} до {size_list[interval_end]} байт")
+print(f"Основний інтервал: від {size_values[start_group]} до {size_values[end_group]} байт")
 print(f"Кількість файлів в інтервалі: {interval_end - interval_start + 1}")
-print(f"Відсоток файлів в інтервалі: {(interval_end - interval_start + 1) / len(size_list) * 100:.2f}%")
+print(f"Відсоток файлів в інтервалі: {(interval_end - interval_start + 1) / count_preffix[-1] * 100:.2f}%")
 
 plt.savefig('logarithmic_histogram_with_interval.png', dpi=200)
 plt.show()
\ No newline at end of file
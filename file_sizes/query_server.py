@@ -0,0 +1,281 @@
+import argparse
+import json
+import math
+import threading
+import traceback
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+import file_helper as fh
+from range_index import RangeIndex
+import two_pointers_for_quantity as tpq
+import two_pointers_technique as tp
+from categories_diagram import CATEGORY_BORDERS
+
+MAJORITY_CACHE_SIZE = 256
+
+
+class LoadedSnapshot:
+    """
+    Завантажений у пам'ять знімок у стиснутому вигляді: відсортовані унікальні розміри,
+    їх кількості та префіксні суми кількостей і обсягів.
+    Після створення об'єкт не змінюється, тому його можна читати з багатьох потоків.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.values, self.counts = fh.get_size_counts(filename)
+        self.index = RangeIndex.build(self.values, self.counts)
+        self.count_preffix, self.bytes_preffix = self.index.count_preffix, self.index.bytes_preffix
+        self.file_count = int(self.count_preffix[-1])
+        self.total_size = int(self.bytes_preffix[-1])
+        self.categories = {name: self.get_range(lower, upper)["count"]
+                           for name, lower, upper in CATEGORY_BORDERS}
+        self._majority_cache = OrderedDict()
+        self._majority_lock = threading.Lock()
+
+    def get_size_at(self, position: int) -> int:
+        """Розмір файлу з номером position (з 0) у відсортованому порядку"""
+        return tp.get_size_at(self.values, self.count_preffix, position + 1)
+
+    def get_percentile(self, percent: float) -> float:
+        """Розмір на заданому перцентилі (лінійна інтерполяція, як у np.percentile)"""
+        if not 0 <= percent <= 100:
+            raise ValueError(f"Перцентиль має бути від 0 до 100: {percent}")
+        if self.file_count == 0:
+            return 0
+        position = percent / 100 * (self.file_count - 1)
+        lower = int(math.floor(position))
+        upper = min(lower + 1, self.file_count - 1)
+        fraction = position - lower
+        lower_size, upper_size = self.get_size_at(lower), self.get_size_at(upper)
+        return float(lower_size + (upper_size - lower_size) * fraction)
+
+    def get_rank(self, size: int) -> dict:
+        """Кількість і частка файлів, менших за size та не більших за size"""
+        below = int(self.count_preffix[np.searchsorted(self.values, size, side='left')])
+        not_above = int(self.count_preffix[np.searchsorted(self.values, size, side='right')])
+        return {
+            "below": below,
+            "not_above": not_above,
+            "percent_below": below / self.file_count * 100 if self.file_count else 0,
+            "percent_not_above": not_above / self.file_count * 100 if self.file_count else 0
+        }
+
+    def get_range(self, lower, upper) -> dict:
+        """Кількість файлів і сумарний обсяг для розмірів у діапазоні [lower, upper)"""
+        result = self.get_ranges([lower], [upper])
+        return {
+            "count": result["counts"][0],
+            "bytes": result["bytes"][0],
+            "count_share": result["count_shares"][0],
+            "bytes_share": result["bytes_shares"][0]
+        }
+
+    def get_ranges(self, lower, upper) -> dict:
+        """Векторизований варіант get_range для масивів меж"""
+        return {key: array.tolist() for key, array in self.index.query(lower, upper).items()}
+
+    def get_majority(self, kind: str, majority_coeff: float) -> dict:
+        """
+        Інтервал переважної більшості. Результати кешуються для MAJORITY_CACHE_SIZE
+        останніх пар kind/coeff.
+
+        Args:
+            kind (str): 'count' - мін. кількість файлів з часткою простору >= coeff,
+                        'range' - мін. обсяг з часткою простору >= coeff,
+                        'borders' - найвужчий діапазон розмірів з часткою файлів >= coeff
+            majority_coeff (float): Поріг переважної більшості, від 0 (не включно) до 1
+        """
+        if not 0 < majority_coeff <= 1:
+            raise ValueError(f"Поріг переважної більшості має бути в межах (0, 1]: {majority_coeff}")
+        if self.file_count == 0:
+            raise ValueError("Знімок порожній")
+
+        key = (kind, majority_coeff)
+        with self._majority_lock:
+            if key in self._majority_cache:
+                self._majority_cache.move_to_end(key)
+                return self._majority_cache[key]
+
+        if kind == 'count':
+            l, r = tp.get_weighted_interval_with_min_count(self.values, self.counts, majority_coeff)
+        elif kind == 'range':
+            l, r = tp.get_weighted_interval_with_min_range(self.values, self.counts, majority_coeff)
+        elif kind == 'borders':
+            l, r = tpq.get_weighted_interval_with_min_borders(self.values, self.counts, majority_coeff)
+        else:
+            raise ValueError(f"Невідомий тип інтервалу: {kind}")
+
+        interval_bytes = int(tp.get_weighted_sum(self.values, self.count_preffix, self.bytes_preffix, r)
+                             - tp.get_weighted_sum(self.values, self.count_preffix, self.bytes_preffix, l - 1))
+        result = {
+            "l": l,
+            "r": r,
+            "lower_size": self.get_size_at(l - 1),
+            "upper_size": self.get_size_at(r - 1),
+            "count": r - l + 1,
+            "bytes": interval_bytes,
+            "count_share": (r - l + 1) / self.file_count,
+            "bytes_share": interval_bytes / self.total_size if self.total_size else 0
+        }
+        with self._majority_lock:
+            self._majority_cache[key] = result
+            if len(self._majority_cache) > MAJORITY_CACHE_SIZE:
+                self._majority_cache.popitem(last=False)
+        return result
+
+
+class SnapshotRegistry:
+    """
+    Набір іменованих знімків. Перезавантаження будує новий знімок поруч зі старим
+    і лише потім підміняє посилання, тож запити не блокуються на час читання CSV.
+    """
+
+    def __init__(self, filenames: dict):
+        self._filenames = dict(filenames)
+        self._snapshots = {name: LoadedSnapshot(filename) for name, filename in self._filenames.items()}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> LoadedSnapshot:
+        with self._lock:
+            if name not in self._snapshots:
+                raise KeyError(f"Невідомий знімок: {name}")
+            return self._snapshots[name]
+
+    def names(self) -> list[str]:
+        with self._lock:
+            return list(self._snapshots.keys())
+
+    def reload(self, name: str, filename: str = None) -> LoadedSnapshot:
+        with self._lock:
+            filename = filename or self._filenames.get(name)
+        if filename is None:
+            raise KeyError(f"Невідомий знімок: {name}")
+
+        snapshot = LoadedSnapshot(filename)
+        with self._lock:
+            self._filenames[name] = filename
+            self._snapshots[name] = snapshot
+        return snapshot
+
+
+class QueryHandler(BaseHTTPRequestHandler):
+    registry: SnapshotRegistry = None
+
+    def do_GET(self):
+        self._handle()
+
+    def do_POST(self):
+        self._handle()
+
+    def _handle(self):
+        url = urlparse(self.path)
+        command = url.path.strip('/')
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        # Перезавантаження змінює стан сервера, тому лише через POST
+        if command == 'reload' and self.command != 'POST':
+            self._send(405, {"error": "reload приймається лише методом POST"}, {'Allow': 'POST'})
+            return
+        try:
+            result = self._dispatch(command, params)
+            self._send(200, result)
+        except FileNotFoundError as error:
+            self._send(404, {"error": f"Файл не знайдено: {error.filename}"})
+        except OSError as error:
+            self._send(400, {"error": f"Не вдалося прочитати файл: {error}"})
+        except KeyError as error:
+            self._send(400, {"error": f"Відсутній параметр або знімок: {error.args[0] if error.args else ''}"})
+        except ValueError as error:
+            self._send(400, {"error": str(error)})
+        except Exception as error:
+            traceback.print_exc()
+            self._send(500, {"error": f"Внутрішня помилка: {type(error).__name__}"})
+
+    def _dispatch(self, command: str, params: dict):
+        if command == 'snapshots':
+            return self.registry.names()
+
+        name = params.get('snapshot', 'default')
+        if command == 'reload':
+            snapshot = self.registry.reload(name, params.get('file'))
+            return {"snapshot": name, "file": snapshot.filename, "file_count": snapshot.file_count}
+
+        snapshot = self.registry.get(name)
+        if command == 'percentile':
+            return {"size": snapshot.get_percentile(float(params['p']))}
+        if command == 'rank':
+            return snapshot.get_rank(int(params['size']))
+        if command == 'range':
+            upper = float(params['b']) if 'b' in params else float('inf')
+            return snapshot.get_range(int(params.get('a', 0)), upper)
+        if command == 'ranges':
+            lower = [float(value) for value in params['a'].split(',')]
+            upper = [float(value) for value in params['b'].split(',')]
+            if len(lower) != len(upper):
+                raise ValueError("Кількість нижніх і верхніх меж має збігатися")
+            return snapshot.get_ranges(lower, upper)
+        if command == 'categories':
+            return snapshot.categories
+        if command == 'majority':
+            return snapshot.get_majority(params.get('kind', 'count'), float(params.get('coeff', 0.9)))
+        if command == 'summary':
+            return {"file": snapshot.filename, "file_count": snapshot.file_count, "total_size": snapshot.total_size}
+        raise ValueError(f"Невідома команда: {command}")
+
+    def _send(self, status: int, payload, headers: dict = None):
+        body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(filenames: dict, host: str = '127.0.0.1', port: int = 8765):
+    """
+    Запускає локальний HTTP-сервіс запитів над завантаженими знімками.
+
+    Приклади запитів:
+        /percentile?p=95&snapshot=default
+        /rank?size=4194304
+        /range?a=1024&b=1048576
+        /ranges?a=0,1024,1048576&b=1024,1048576,inf
+        /categories
+        /majority?kind=count&coeff=0.95
+        POST /reload?snapshot=default&file=new_snapshot.csv
+
+    Args:
+        filenames (dict): Відповідність ім'я знімка -> шлях до CSV
+        host (str): Адреса для прослуховування
+        port (int): Порт
+    """
+    QueryHandler.registry = SnapshotRegistry(filenames)
+    server = ThreadingHTTPServer((host, port), QueryHandler)
+    print(f"Сервіс запитів слухає http://{host}:{port} (знімки: {', '.join(QueryHandler.registry.names())})")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Резидентний сервіс запитів до знімків розмірів файлів")
+    parser.add_argument('snapshots', nargs='*', help="Знімки у форматі name=path.csv або path.csv")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+
+    filenames = {}
+    for item in args.snapshots or [fh.STATS_FILENAME]:
+        name, _, filename = item.rpartition('=')
+        filenames[name or 'default'] = filename
+    serve(filenames, args.host, args.port)
@@ -0,0 +1,148 @@
+import os
+
+import numpy as np
+
+import file_helper as fh
+import two_pointers_technique as tp
+
+DEFAULT_FENCE_STEP = 4096
+INT64_MIN, INT64_MAX = np.iinfo(np.int64).min, np.iinfo(np.int64).max
+
+
+def to_int_bounds(bounds) -> np.ndarray:
+    """
+    Переводить межі у int64, щоб searchsorted не перетворював увесь масив розмірів
+    на float64 при кожному запиті. Розміри цілі, тож "менше за x" - це "менше за ceil(x)";
+    нескінченності обрізаються до меж int64.
+    """
+    bounds = np.atleast_1d(np.asarray(bounds))
+    if bounds.dtype.kind in 'iub':
+        return bounds.astype(np.int64)
+    bounds = bounds.astype(np.float64)
+    if np.isnan(bounds).any():
+        raise ValueError("Межа діапазону не може бути NaN")
+    result = np.full(len(bounds), INT64_MAX, dtype=np.int64)
+    result[bounds < -2.0 ** 63] = INT64_MIN
+    inside = (bounds >= -2.0 ** 63) & (bounds < 2.0 ** 63)
+    result[inside] = np.ceil(bounds[inside]).astype(np.int64)
+    return result
+
+
+class RangeIndex:
+    """
+    Індекс для запитів "скільки файлів і байтів мають розмір у [a, b)" за O(log m).
+    Зберігає відсортовані унікальні розміри та префіксні суми кількостей і обсягів (int64).
+
+    Для індексу, відкритого через memmap, у пам'яті тримається лише розріджена таблиця
+    меж (кожен fence_step-й розмір): спершу шукаємо блок у ній, а потім читаємо з диска
+    тільки потрібний блок. Таблиця зберігається разом з індексом, тож при відкритті
+    не потрібно проходити весь файл розмірів.
+    """
+
+    def __init__(self, values, count_preffix, bytes_preffix, fence_step: int = DEFAULT_FENCE_STEP, fences=None):
+        self.values = values
+        self.count_preffix = count_preffix
+        self.bytes_preffix = bytes_preffix
+        self.fence_step = fence_step
+        self.fences = np.array(values[::fence_step] if fences is None else fences, dtype=np.int64)
+        self.file_count = int(count_preffix[-1])
+        self.total_size = int(bytes_preffix[-1])
+
+    @classmethod
+    def build(cls, values, counts, fence_step: int = DEFAULT_FENCE_STEP):
+        """Будує індекс зі стиснутого представлення (унікальні розміри, кількості)"""
+        count_preffix, bytes_preffix = tp.create_weighted_preffix_sums(values, counts)
+        return cls(np.asarray(values, dtype=np.int64), count_preffix, bytes_preffix, fence_step)
+
+    @classmethod
+    def from_sizes(cls, input_list, fence_step: int = DEFAULT_FENCE_STEP):
+        return cls.build(*fh.compress_sizes(input_list), fence_step=fence_step)
+
+    def save(self, directory: str):
+        """Зберігає індекс у каталог як набір .npy файлів, придатних для memmap"""
+        os.makedirs(directory, exist_ok=True)
+        np.save(os.path.join(directory, "values.npy"), np.asarray(self.values))
+        np.save(os.path.join(directory, "count_preffix.npy"), np.asarray(self.count_preffix))
+        np.save(os.path.join(directory, "bytes_preffix.npy"), np.asarray(self.bytes_preffix))
+        np.save(os.path.join(directory, "fences.npy"), self.fences)
+        np.save(os.path.join(directory, "fence_step.npy"), np.array([self.fence_step], dtype=np.int64))
+
+    @classmethod
+    def load(cls, directory: str, mmap: bool = True):
+        """
+        Відкриває збережений індекс.
+
+        Args:
+            directory (str): Каталог, створений методом save
+            mmap (bool): Відобразити масиви у пам'ять замість повного читання
+        """
+        mmap_mode = 'r' if mmap else None
+        values = np.load(os.path.join(directory, "values.npy"), mmap_mode=mmap_mode)
+        count_preffix = np.load(os.path.join(directory, "count_preffix.npy"), mmap_mode=mmap_mode)
+        bytes_preffix = np.load(os.path.join(directory, "bytes_preffix.npy"), mmap_mode=mmap_mode)
+        step_filename = os.path.join(directory, "fence_step.npy")
+        if os.path.exists(step_filename):
+            fence_step = int(np.load(step_filename)[0])
+            fences = np.load(os.path.join(directory, "fences.npy"))
+        else:
+            # Старий формат: fences.npy містив лише крок, таблицю будуємо заново
+            fence_step = int(np.load(os.path.join(directory, "fences.npy"))[0])
+            fences = None
+        return cls(values, count_preffix, bytes_preffix, fence_step, fences)
+
+    def locate(self, bounds) -> np.ndarray:
+        """
+        Для кожної межі повертає кількість унікальних розмірів, строго менших за неї
+        (аналог np.searchsorted(values, bounds, side='left')).
+        """
+        bounds = to_int_bounds(bounds)
+        if not isinstance(self.values, np.memmap):
+            return np.searchsorted(self.values, bounds, side='left')
+
+        # Шукаємо блок у таблиці меж, далі кожен потрібний блок читаємо з диска один раз
+        blocks = np.maximum(np.searchsorted(self.fences, bounds, side='left') - 1, 0)
+        positions = np.empty(len(bounds), dtype=np.int64)
+        for block in np.unique(blocks):
+            start = int(block) * self.fence_step
+            chunk = np.asarray(self.values[start:start + self.fence_step + 1])
+            selected = blocks == block
+            positions[selected] = start + np.searchsorted(chunk, bounds[selected], side='left')
+        return positions
+
+    def query(self, lower, upper) -> dict:
+        """
+        Векторизований запит для діапазонів [lower[i], upper[i]).
+
+        Args:
+            lower (array-like): Нижні межі розмірів (включно)
+            upper (array-like): Верхні межі розмірів (невключно), можна передати np.inf
+
+        Returns:
+            dict: Масиви counts, bytes, count_shares, bytes_shares
+        """
+        lower = to_int_bounds(lower)
+        upper = to_int_bounds(upper)
+        positions = self.locate(np.concatenate((lower, upper)))
+        l, r = positions[:len(lower)], positions[len(lower):]
+        r = np.maximum(l, r)
+
+        count_preffix = np.asarray(self.count_preffix[np.concatenate((l, r))])
+        bytes_preffix = np.asarray(self.bytes_preffix[np.concatenate((l, r))])
+        counts = count_preffix[len(l):] - count_preffix[:len(l)]
+        range_bytes = bytes_preffix[len(l):] - bytes_preffix[:len(l)]
+        return {
+            "counts": counts,
+            "bytes": range_bytes,
+            "count_shares": counts / self.file_count if self.file_count else np.zeros(len(counts)),
+            "bytes_shares": range_bytes / self.total_size if self.total_size else np.zeros(len(range_bytes))
+        }
+
+
+if __name__ == "__main__":
+    index = RangeIndex.build(*fh.get_size_counts(fh.STATS_FILENAME))
+    index.save("file_size_sys.index")
+
+    borders = 1024 ** np.arange(5)
+    result = RangeIndex.load("file_size_sys.index").query(borders[:-1], borders[1:])
+    for lower, upper, count, share in zip(borders[:-1], borders[1:], result["counts"], result["bytes_shares"]):
+        print(f"[{lower}, {upper}): {count} файлів, {share*100:.2f}% простору")
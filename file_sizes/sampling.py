@@ -0,0 +1,256 @@
+import argparse
+import math
+import os
+import random
+import time
+
+import numpy as np
+
+import stats
+from categories_diagram import CATEGORY_BORDERS, get_category_indices
+
+DEFAULT_PROBES = 2000
+DEFAULT_MAX_SECONDS = 50
+BOOTSTRAP_ROUNDS = 200
+Z_95 = 1.959963984540054
+
+
+def _get_subdirectory_weight(entry) -> int:
+    """
+    Вага підкаталогу при спуску: 1 + кількість його підкаталогів. На більшості файлових систем
+    st_nlink каталогу дорівнює 2 + кількість підкаталогів, тож спуск частіше йде у гілки з
+    більшим деревом, що зменшує дисперсію оцінки. Якщо st_nlink недоступний - рівномірно.
+    """
+    try:
+        return max(1, entry.stat(follow_symlinks=False).st_nlink - 1)
+    except OSError:
+        return 1
+
+
+def _list_directory(directory: str) -> tuple[list[int], list[str], list[int]]:
+    """
+    Один прохід по каталогу: розміри файлів, підкаталоги та їхні ваги.
+    Недоступний каталог вважається порожнім.
+    """
+    file_sizes, subdirectories, subdirectory_weights = [], [], []
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirectories.append(entry.path)
+                        subdirectory_weights.append(_get_subdirectory_weight(entry))
+                    elif entry.is_file(follow_symlinks=False):
+                        file_sizes.append(entry.stat(follow_symlinks=False).st_size)
+                except OSError:
+                    continue
+    except OSError:
+        pass
+    return file_sizes, subdirectories, subdirectory_weights
+
+
+def run_probe(root: str, rng: random.Random, listings: dict = None,
+              deadline: float = None) -> list[tuple[int, float]]:
+    """
+    Одна проба: випадковий спуск від root до листового каталогу. На кожному рівні обираємо
+    підкаталог з імовірністю p, пропорційною його вазі, і множимо вагу шляху на 1 / p.
+    Файли кожного відвіданого каталогу отримують вагу шляху до нього - це незміщена
+    (оцінка Кнута / Горвіца - Томпсона) оцінка всього дерева.
+
+    Args:
+        root (str): Корінь дерева каталогів
+        rng (random.Random): Генератор для вибору підкаталогів
+        listings (dict): Кеш _list_directory між пробами; верхні рівні спільні для всіх
+                         спусків, тож кожен каталог читається і stat-иться лише раз
+        deadline (float): Момент time.monotonic(), після якого спуск переривається
+
+    Returns:
+        list: Кортежі (розмір, вага) для файлів відвіданих каталогів, або None, якщо спуск
+              перервано: неповна проба зміщувала б оцінку
+    """
+    if listings is None:
+        listings = {}
+    sample = []
+    directory, weight = root, 1.0
+    while directory is not None:
+        if deadline is not None and time.monotonic() >= deadline:
+            return None
+        if directory not in listings:
+            listings[directory] = _list_directory(directory)
+        file_sizes, subdirectories, subdirectory_weights = listings[directory]
+        sample.extend((size, weight) for size in file_sizes)
+
+        if not subdirectories:
+            directory = None
+        else:
+            index = rng.choices(range(len(subdirectories)), weights=subdirectory_weights)[0]
+            weight *= sum(subdirectory_weights) / subdirectory_weights[index]
+            directory = subdirectories[index]
+    return sample
+
+
+def _to_counts(sizes, weights, rng: np.random.Generator) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Зводить зважену вибірку до стиснутого представлення з цілими кількостями.
+    Дробові ваги округлюються стохастично, тож очікувана кількість не зміщується.
+    """
+    if len(sizes) == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    values, inverse = np.unique(np.asarray(sizes, dtype=np.int64), return_inverse=True)
+    totals = np.bincount(inverse, weights=weights)
+    counts = np.floor(totals) + (rng.random(len(totals)) < totals - np.floor(totals))
+    keep = counts > 0
+    return values[keep], counts[keep].astype(np.int64)
+
+
+def _get_interval(samples) -> tuple[float, float, float]:
+    """Оцінка (середнє по пробах) і 95% довірчий інтервал за центральною граничною теоремою"""
+    samples = np.asarray(samples, dtype=np.float64)
+    mean = float(samples.mean())
+    if len(samples) < 2:
+        return mean, mean, mean
+    margin = Z_95 * float(samples.std(ddof=1)) / math.sqrt(len(samples))
+    return mean, mean - margin, mean + margin
+
+
+def estimate_tree(root: str, probes: int = DEFAULT_PROBES, max_seconds: float = DEFAULT_MAX_SECONDS,
+                  seed: int = None) -> dict:
+    """
+    Швидка оцінка розподілу розмірів без повного обходу дерева.
+
+    Args:
+        root (str): Корінь дерева каталогів
+        probes (int): Максимальна кількість проб (спусків)
+        max_seconds (float): Обмеження часу; після нього використовуються вже зроблені проби
+        seed (int): Зерно генератора для відтворюваності
+
+    Returns:
+        dict: stats - результат stats.get_weighted_file_statistics для зваженої вибірки
+              (file_count і total_size - оцінки для всього дерева), intervals - оцінки з 95%
+              довірчими інтервалами (оцінка, нижня межа, верхня межа), categories і log_bins -
+              оцінки кількості файлів з інтервалами, values і counts - зважена вибірка
+              у стиснутому вигляді в масштабі одного дерева (для гістограм з weights=counts),
+              probes - кількість проб
+    """
+    rng = random.Random(seed)
+    np_rng = np.random.default_rng(seed)
+    deadline = time.monotonic() + max_seconds
+
+    probe_samples, listings = [], {}
+    while len(probe_samples) < probes and time.monotonic() < deadline:
+        sample = run_probe(root, rng, listings, deadline)
+        if sample is not None:
+            probe_samples.append(sample)
+    probe_count = len(probe_samples)
+
+    # Показники кожної проби окремо - з їх розкиду отримуємо довірчі інтервали
+    per_probe_files, per_probe_bytes = np.zeros(probe_count), np.zeros(probe_count)
+    per_probe_categories = np.zeros((probe_count, len(CATEGORY_BORDERS)))
+    per_probe_bins = {}
+    all_sizes, all_weights = [], []
+    for index, sample in enumerate(probe_samples):
+        if not sample:
+            continue
+        sizes = np.array([size for size, _ in sample], dtype=np.int64)
+        weights = np.array([weight for _, weight in sample])
+        per_probe_files[index] = weights.sum()
+        per_probe_bytes[index] = (sizes * weights).sum()
+        per_probe_categories[index] = np.bincount(get_category_indices(sizes),
+                                                  weights=weights, minlength=len(CATEGORY_BORDERS))
+        exponents = np.where(sizes > 0, np.floor(np.log10(np.maximum(sizes, 1))), -1).astype(np.int64)
+        for exponent in np.unique(exponents):
+            per_probe_bins.setdefault(int(exponent), np.zeros(probe_count))[index] = weights[exponents == exponent].sum()
+        all_sizes.append(sizes)
+        all_weights.append(weights)
+
+    if not all_sizes:
+        return {"stats": {"error": "Вибірка порожня"}, "intervals": {}, "categories": {}, "log_bins": {}, "probes": probe_count}
+
+    # Ваги всіх проб разом описують probe_count копій дерева; ділимо їх ще до округлення,
+    # щоб кількості (і обсяги в префіксних сумах) були в масштабі одного дерева і не
+    # переповнювали int64 на великих деревах
+    values, counts = _to_counts(np.concatenate(all_sizes), np.concatenate(all_weights) / probe_count, np_rng)
+    if len(values) == 0:
+        return {"stats": {"error": "Вибірка порожня"}, "intervals": {}, "categories": {}, "log_bins": {}, "probes": probe_count}
+    sample_stats = stats.get_weighted_file_statistics(values, counts)
+    # Кількість і обсяг - середні по пробах, без похибки округлення ваг
+    sample_stats["file_count"] = per_probe_files.mean()
+    sample_stats["total_size"] = per_probe_bytes.mean()
+    total_size = sample_stats["total_size"]
+    sample_stats["min_relative_size"] = sample_stats["min_size"] / total_size if total_size > 0 else 0
+    sample_stats["max_relative_size"] = sample_stats["max_size"] / total_size if total_size > 0 else 0
+
+    intervals = {
+        "file_count": _get_interval(per_probe_files),
+        "total_size": _get_interval(per_probe_bytes),
+        "mean_size": _get_ratio_interval(per_probe_bytes, per_probe_files)
+    }
+    intervals.update(_bootstrap_percentiles(all_sizes, all_weights, probe_count, np_rng))
+
+    categories = {name: _get_interval(per_probe_categories[:, index])
+                  for index, (name, _, _) in enumerate(CATEGORY_BORDERS)}
+    log_bins = {exponent: _get_interval(values_per_probe) for exponent, values_per_probe in sorted(per_probe_bins.items())}
+
+    return {"stats": sample_stats, "intervals": intervals, "categories": categories,
+            "log_bins": log_bins, "values": values, "counts": counts, "probes": probe_count}
+
+
+def _get_ratio_interval(numerators, denominators) -> tuple[float, float, float]:
+    """Довірчий інтервал для відношення сум (середній розмір) дельта-методом"""
+    ratio = numerators.sum() / denominators.sum() if denominators.sum() > 0 else 0.0
+    if len(numerators) < 2 or denominators.mean() == 0:
+        return ratio, ratio, ratio
+    residuals = numerators - ratio * denominators
+    margin = Z_95 * residuals.std(ddof=1) / (denominators.mean() * math.sqrt(len(numerators)))
+    return ratio, ratio - margin, ratio + margin
+
+
+def _bootstrap_percentiles(all_sizes, all_weights, probe_count: int, rng: np.random.Generator) -> dict:
+    """Бутстреп по пробах для квантилів, для яких немає простої формули дисперсії"""
+    percentiles = {"median_size": 50, "q1_size": 25, "q3_size": 75}
+    nonempty = len(all_sizes)
+    estimates = {name: [] for name in percentiles}
+    for _ in range(BOOTSTRAP_ROUNDS):
+        chosen = rng.integers(0, nonempty, nonempty)
+        sizes = np.concatenate([all_sizes[index] for index in chosen])
+        weights = np.concatenate([all_weights[index] for index in chosen])
+        order = np.argsort(sizes, kind='stable')
+        cumulative = np.cumsum(weights[order])
+        for name, percent in percentiles.items():
+            position = min(np.searchsorted(cumulative, percent / 100 * cumulative[-1]), len(order) - 1)
+            estimates[name].append(sizes[order[position]])
+
+    result = {}
+    for name, percent in percentiles.items():
+        lower, upper = np.percentile(estimates[name], [2.5, 97.5])
+        result[name] = (float(np.median(estimates[name])), float(lower), float(upper))
+    return result
+
+
+def print_estimate(estimate: dict):
+    """Виводить оцінку з довірчими інтервалами"""
+    print(f"\n=== ОЦІНКА ЗА ВИБІРКОЮ ({estimate['probes']} проб, 95% довірчі інтервали) ===\n")
+    for name, (value, lower, upper) in estimate["intervals"].items():
+        print(f"{name}: {value:,.1f} [{lower:,.1f}; {upper:,.1f}]")
+
+    print("\n--- КАТЕГОРІЇ ---")
+    for name, (value, lower, upper) in estimate["categories"].items():
+        print(f"{name}: {value:,.0f} файлів [{lower:,.0f}; {upper:,.0f}]")
+
+    print("\n--- ЛОГАРИФМІЧНА ГІСТОГРАМА ---")
+    for exponent, (value, lower, upper) in estimate["log_bins"].items():
+        label = "0 B" if exponent < 0 else f"{10 ** exponent}-{10 ** (exponent + 1)}"
+        print(f"{label}: {value:,.0f} файлів [{lower:,.0f}; {upper:,.0f}]")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Швидка оцінка розподілу розмірів файлів за випадковою вибіркою каталогів")
+    parser.add_argument('root')
+    parser.add_argument('--probes', type=int, default=DEFAULT_PROBES)
+    parser.add_argument('--max-seconds', type=float, default=DEFAULT_MAX_SECONDS)
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    estimate = estimate_tree(args.root, args.probes, args.max_seconds, args.seed)
+    stats.print_file_statistics(estimate["stats"])
+    print_estimate(estimate)
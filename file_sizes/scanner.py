@@ -0,0 +1,280 @@
+import argparse
+import json
+import os
+import signal
+import sys
+import time
+from array import array
+
+import numpy as np
+
+from categories_diagram import CATEGORY_BORDERS, get_category_indices
+from external_sort import DEFAULT_MEMORY_BUDGET, ITEM_SIZE, merge_sorted_runs, write_sorted_run
+
+DEFAULT_CHECKPOINT_INTERVAL = 60  # секунд
+DEFAULT_PROGRESS_INTERVAL = 5  # секунд
+
+
+class ResumableScan:
+    """
+    Обхід дерева каталогів із записом "path,size" у CSV (формат file_helper.get_sizes),
+    який періодично зберігає контрольну точку і може продовжити роботу після збою або SIGTERM.
+    З keep_times рядки мають вигляд "path,mtime,atime,size" для size_age; get_sizes читає і їх.
+
+    Контрольна точка містить стек ще не оброблених каталогів, часткові агрегати,
+    зсув у CSV, до якого дані гарантовано записані, та список вже скинутих на диск
+    відсортованих частин розмірів. Каталог обробляється повністю між контрольними точками,
+    тому після відновлення CSV обрізається до збереженого зсуву, а незавершені каталоги
+    просто скануються повторно.
+    """
+
+    def __init__(self, root: str, output_filename: str, checkpoint_filename: str = None,
+                 memory_budget: int = DEFAULT_MEMORY_BUDGET, checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+                 progress_interval: float = DEFAULT_PROGRESS_INTERVAL, expected_entries: int = None,
+                 on_progress=None, keep_times: bool = False):
+        self.root = os.path.abspath(root)
+        self.output_filename = output_filename
+        self.checkpoint_filename = checkpoint_filename or output_filename + ".checkpoint.json"
+        self.run_dir = output_filename + ".runs"
+        self.sorted_filename = output_filename + ".sorted.bin"
+        self.buffer_limit = max(1024, memory_budget // (2 * ITEM_SIZE))
+        self.checkpoint_interval = checkpoint_interval
+        self.progress_interval = progress_interval
+        self.expected_entries = expected_entries or _estimate_entries(self.root)
+        self.on_progress = on_progress or print_progress
+        self.keep_times = keep_times
+        self._stop_requested = False
+        self._sizes = array('q')
+
+    def _new_state(self) -> dict:
+        return {
+            "root": self.root,
+            "keep_times": self.keep_times,
+            "pending": [self.root],
+            "completed_dirs": 0,
+            "entries": 0,
+            "file_count": 0,
+            "total_size": 0,
+            "error_count": 0,
+            "categories": {name: 0 for name, _, _ in CATEGORY_BORDERS},
+            "csv_offset": 0,
+            "runs": [],
+            "elapsed": 0.0,
+            "finished": False
+        }
+
+    def load_state(self) -> dict:
+        """
+        Читає контрольну точку для цього ж кореня або створює новий стан.
+        Якщо CSV коротший за збережений зсув або зникли відсортовані частини,
+        контрольна точка не відповідає даним на диску і обхід починається заново.
+        Так само заново починається обхід, збережений з іншим keep_times: формат рядків CSV інший.
+        """
+        if os.path.exists(self.checkpoint_filename):
+            with open(self.checkpoint_filename) as file:
+                state = json.load(file)
+            if state["root"] == self.root:
+                same_format = state.get("keep_times", False) == self.keep_times
+                if same_format and (state["finished"] or self._matches_output(state)):
+                    return state
+                print(f"Контрольна точка {self.checkpoint_filename} не відповідає {self.output_filename}, "
+                      f"обхід починається заново", file=sys.stderr)
+                for run_filename in state["runs"]:
+                    if os.path.exists(run_filename):
+                        os.remove(run_filename)
+        return self._new_state()
+
+    def _matches_output(self, state: dict) -> bool:
+        if state["csv_offset"] > 0:
+            if not os.path.exists(self.output_filename) or os.path.getsize(self.output_filename) < state["csv_offset"]:
+                return False
+        return all(os.path.exists(run_filename) for run_filename in state["runs"])
+
+    def request_stop(self, *args):
+        """Просить обхід зупинитися після поточного каталогу зі збереженням контрольної точки"""
+        self._stop_requested = True
+
+    def run(self) -> dict:
+        """
+        Виконує (або продовжує) обхід.
+
+        Returns:
+            dict: Підсумковий стан з агрегатами; state["finished"] показує, чи обхід завершено
+        """
+        state = self.load_state()
+        if state["finished"]:
+            return state
+
+        os.makedirs(self.run_dir, exist_ok=True)
+        mode = 'r+b' if state["csv_offset"] > 0 else 'wb'
+        previous_handler = _install_sigterm(self.request_stop)
+        try:
+            with open(self.output_filename, mode) as output:
+                output.truncate(state["csv_offset"])
+                output.seek(state["csv_offset"])
+                if state["csv_offset"] == 0:
+                    output.write(b"path,mtime,atime,size\n" if self.keep_times else b"path,size\n")
+                self._walk(state, output)
+        finally:
+            _restore_sigterm(previous_handler)
+
+        if not state["pending"]:
+            merge_sorted_runs(state["runs"], self.sorted_filename)
+            for run_filename in state["runs"]:
+                os.remove(run_filename)
+            state["runs"] = []
+            state["finished"] = True
+            self._write_checkpoint(state)
+            os.rmdir(self.run_dir)
+        return state
+
+    def _walk(self, state: dict, output):
+        category_names = [border[0] for border in CATEGORY_BORDERS]
+        category_counts = np.array([state["categories"][name] for name in category_names], dtype=np.int64)
+
+        started = time.monotonic() - state["elapsed"]
+        last_checkpoint = last_progress = time.monotonic()
+        session_entries, session_bytes, session_started = 0, 0, time.monotonic()
+
+        def save():
+            state["categories"] = dict(zip(category_names, category_counts.tolist()))
+            state["elapsed"] = time.monotonic() - started
+            output.flush()
+            os.fsync(output.fileno())
+            state["csv_offset"] = output.tell()
+            self._spill(state)
+            self._write_checkpoint(state)
+
+        while state["pending"] and not self._stop_requested:
+            directory = state["pending"].pop()
+            subdirectories, lines, sizes = [], [], []
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                subdirectories.append(entry.path)
+                            elif entry.is_file(follow_symlinks=False):
+                                info = entry.stat(follow_symlinks=False)
+                                size = info.st_size
+                                times = f"{info.st_mtime},{info.st_atime},".encode() if self.keep_times else b""
+                                lines.append(os.fsencode(entry.path) + b"," + times + str(size).encode() + b"\n")
+                                sizes.append(size)
+                        except OSError:
+                            state["error_count"] += 1
+            except OSError:
+                state["error_count"] += 1
+
+            output.write(b"".join(lines))
+            self._sizes.extend(sizes)
+            if sizes:
+                np.add.at(category_counts, get_category_indices(sizes), 1)
+            state["pending"].extend(reversed(subdirectories))
+            state["completed_dirs"] += 1
+            state["entries"] += len(sizes) + len(subdirectories)
+            state["file_count"] += len(sizes)
+            state["total_size"] += sum(sizes)
+            session_entries += len(sizes) + len(subdirectories)
+            session_bytes += sum(sizes)
+
+            if len(self._sizes) >= self.buffer_limit:
+                self._spill(state)
+
+            now = time.monotonic()
+            if now - last_progress >= self.progress_interval:
+                self.on_progress(self._get_progress(state, session_entries, session_bytes, now - session_started))
+                last_progress = now
+            if now - last_checkpoint >= self.checkpoint_interval:
+                save()
+                last_checkpoint = now
+
+        save()
+        self.on_progress(self._get_progress(state, session_entries, session_bytes, time.monotonic() - session_started))
+
+    def _spill(self, state: dict):
+        """Скидає накопичені розміри на диск як відсортовану частину"""
+        if len(self._sizes) == 0:
+            return
+        run_filename = os.path.join(self.run_dir, f"run_{len(state['runs']):05d}.bin")
+        write_sorted_run(self._sizes, run_filename)
+        state["runs"].append(run_filename)
+        del self._sizes[:]
+
+    def _write_checkpoint(self, state: dict):
+        # Запис через тимчасовий файл, щоб збій посеред запису не зіпсував контрольну точку
+        temporary_filename = self.checkpoint_filename + ".tmp"
+        with open(temporary_filename, 'w') as file:
+            json.dump(state, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary_filename, self.checkpoint_filename)
+
+    def _get_progress(self, state: dict, session_entries: int, session_bytes: int, session_time: float) -> dict:
+        entries_per_second = session_entries / session_time if session_time > 0 else 0.0
+        if not state["pending"]:
+            remaining = 0
+        else:
+            remaining = max(self.expected_entries - state["entries"], 0) if self.expected_entries else None
+        return {
+            "entries": state["entries"],
+            "file_count": state["file_count"],
+            "total_size": state["total_size"],
+            "completed_dirs": state["completed_dirs"],
+            "queue_depth": len(state["pending"]),
+            "error_count": state["error_count"],
+            "entries_per_second": entries_per_second,
+            "bytes_per_second": session_bytes / session_time if session_time > 0 else 0.0,
+            "eta_seconds": remaining / entries_per_second if remaining is not None and entries_per_second > 0 else None
+        }
+
+
+def _estimate_entries(root: str):
+    """Оцінка кількості записів за зайнятими inode файлової системи (верхня межа)"""
+    try:
+        info = os.statvfs(root)
+        return info.f_files - info.f_ffree if info.f_files > 0 else None
+    except (OSError, AttributeError):
+        return None
+
+
+def _install_sigterm(handler):
+    try:
+        return signal.signal(signal.SIGTERM, handler)
+    except ValueError:  # Не з головного потоку
+        return None
+
+
+def _restore_sigterm(previous_handler):
+    if previous_handler is not None:
+        signal.signal(signal.SIGTERM, previous_handler)
+
+
+def print_progress(progress: dict):
+    eta = progress["eta_seconds"]
+    eta_text = time.strftime('%H:%M:%S', time.gmtime(eta)) if eta is not None else "невідомо"
+    print(f"Записів: {progress['entries']:,} ({progress['entries_per_second']:,.0f}/с), "
+          f"обсяг: {progress['bytes_per_second'] / 1024 ** 2:,.1f} MB/с, "
+          f"черга каталогів: {progress['queue_depth']:,}, помилок: {progress['error_count']}, "
+          f"залишилось: {eta_text}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Відновлюваний обхід каталогів зі збором розмірів файлів")
+    parser.add_argument('root')
+    parser.add_argument('--output', default="file_size_sys.csv")
+    parser.add_argument('--checkpoint', default=None)
+    parser.add_argument('--checkpoint-interval', type=float, default=DEFAULT_CHECKPOINT_INTERVAL)
+    parser.add_argument('--expected-entries', type=int, default=None,
+                        help="Очікувана кількість записів для ETA (наприклад, з попереднього знімка)")
+    parser.add_argument('--times', action='store_true', help="Зберігати mtime і atime поруч з розміром")
+    args = parser.parse_args()
+
+    scan = ResumableScan(args.root, args.output, args.checkpoint,
+                         checkpoint_interval=args.checkpoint_interval, expected_entries=args.expected_entries,
+                         keep_times=args.times)
+    state = scan.run()
+    if state["finished"]:
+        print(f"Готово: {state['file_count']} файлів, {state['total_size']} байт; "
+              f"відсортовані розміри - {scan.sorted_filename}")
+    else:
+        print(f"Обхід зупинено, контрольна точка: {scan.checkpoint_filename}")
@@ -0,0 +1,141 @@
+import multiprocessing
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import file_helper as fh
+import two_pointers_technique as tp
+
+ARRAY_NAMES = ('values', 'counts', 'count_preffix', 'bytes_preffix')
+
+
+class SharedSizes:
+    """
+    Стиснутий набір розмірів (унікальні розміри, кількості) разом із префіксними сумами,
+    розміщений у multiprocessing.shared_memory. Процес-власник публікує дані один раз,
+    а робочі процеси підключаються за описом (іменами блоків) без копіювання.
+
+    Власник звільняє пам'ять через close() або вихід з блоку with;
+    робочі процеси лише від'єднуються.
+    """
+
+    def __init__(self, blocks: dict, lengths: dict, owner: bool):
+        self._blocks = blocks
+        self._lengths = lengths
+        self.owner = owner
+        for name in ARRAY_NAMES:
+            setattr(self, name, np.ndarray((lengths[name],), dtype=np.int64, buffer=blocks[name].buf))
+        self.file_count = int(self.count_preffix[-1])
+        self.total_size = int(self.bytes_preffix[-1])
+
+    @classmethod
+    def publish(cls, values, counts):
+        """Копіює стиснуті дані у спільну пам'ять (єдина копія для всіх процесів)"""
+        count_preffix, bytes_preffix = tp.create_weighted_preffix_sums(values, counts)
+        arrays = {
+            'values': np.asarray(values, dtype=np.int64),
+            'counts': np.asarray(counts, dtype=np.int64),
+            'count_preffix': count_preffix,
+            'bytes_preffix': bytes_preffix
+        }
+
+        blocks = {}
+        try:
+            for name, array in arrays.items():
+                # Блок нульового розміру створити не можна
+                blocks[name] = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                np.ndarray(array.shape, dtype=np.int64, buffer=blocks[name].buf)[:] = array
+        except BaseException:
+            for block in blocks.values():
+                block.close()
+                block.unlink()
+            raise
+        return cls(blocks, {name: len(array) for name, array in arrays.items()}, owner=True)
+
+    @classmethod
+    def from_sizes(cls, input_list):
+        return cls.publish(*fh.compress_sizes(input_list))
+
+    @property
+    def descriptor(self) -> dict:
+        """Невеликий опис, який передається робочим процесам замість самих даних"""
+        return {name: (self._blocks[name].name, self._lengths[name]) for name in ARRAY_NAMES}
+
+    @classmethod
+    def attach(cls, descriptor: dict):
+        """Підключається до вже опублікованих даних за описом"""
+        blocks = {name: _open_block(block_name) for name, (block_name, _) in descriptor.items()}
+        return cls(blocks, {name: length for name, (_, length) in descriptor.items()}, owner=False)
+
+    def close(self):
+        """Від'єднує масиви; власник додатково звільняє спільну пам'ять"""
+        for name in ARRAY_NAMES:
+            setattr(self, name, None)
+        for block in self._blocks.values():
+            block.close()
+            if self.owner:
+                block.unlink()
+        self._blocks = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def _open_block(block_name: str) -> shared_memory.SharedMemory:
+    try:
+        return shared_memory.SharedMemory(name=block_name, track=False)
+    except TypeError:
+        # До Python 3.13 підключення реєструє блок у resource_tracker, і незалежний процес
+        # видалив би його при завершенні. Дочірні процеси multiprocessing ділять трекер
+        # з власником, тому для них реєстрацію не чіпаємо.
+        block = shared_memory.SharedMemory(name=block_name)
+        if multiprocessing.parent_process() is None:
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(block._name, 'shared_memory')
+        return block
+
+
+_worker_dataset = None
+
+def _init_worker(descriptor: dict):
+    global _worker_dataset
+    _worker_dataset = SharedSizes.attach(descriptor)
+
+def _run_in_worker(task):
+    function, argument = task
+    return function(_worker_dataset, argument)
+
+
+def map_shared(function, arguments, dataset: SharedSizes, processes: int = None) -> list:
+    """
+    Виконує function(dataset, argument) для кожного аргументу у пулі процесів.
+    Кожен процес підключається до спільних даних один раз під час запуску,
+    тож N процесів використовують одну копію даних замість N + 1.
+
+    Args:
+        function: Функція верхнього рівня модуля (має серіалізуватися через pickle)
+        arguments (iterable): Аргументи для кожного виклику
+        dataset (SharedSizes): Опубліковані дані
+        processes (int): Кількість процесів (за замовчуванням - кількість ядер)
+
+    Returns:
+        list: Результати у порядку аргументів
+    """
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(dataset.descriptor,)) as pool:
+        return pool.map(_run_in_worker, [(function, argument) for argument in arguments])
+
+
+def get_min_count_answer(dataset: SharedSizes, majority_coeff: float) -> tuple:
+    """Приклад задачі для map_shared: інтервал з мін. кількістю файлів для одного коефіцієнта"""
+    l, r = tp.get_weighted_interval_with_min_count(dataset.values, dataset.counts, majority_coeff)
+    return (majority_coeff, tp.get_size_at(dataset.values, dataset.count_preffix, l),
+            tp.get_size_at(dataset.values, dataset.count_preffix, r), r - l + 1)
+
+
+if __name__ == "__main__":
+    with SharedSizes.publish(*fh.get_size_counts(fh.STATS_FILENAME)) as dataset:
+        for coeff, lower, upper, count in map_shared(get_min_count_answer, [0.5, 0.8, 0.9, 0.95, 0.99], dataset):
+            print(f"{coeff*100:.0f}% простору: {count} файлів розміром від {lower} до {upper} байт")
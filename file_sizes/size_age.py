@@ -0,0 +1,168 @@
+import argparse
+import time
+
+import numpy as np
+
+import file_helper as fh
+from categories_diagram import CATEGORY_BORDERS, get_category_indices
+
+DAY = 24 * 60 * 60
+
+# Межі вікових інтервалів у секундах: (назва, нижня межа включно, верхня межа невключно).
+# Файли з часом у майбутньому потрапляють у перший інтервал.
+AGE_BORDERS = [
+    ('< 1 day', 0, DAY),
+    ('1 - 7 days', DAY, 7 * DAY),
+    ('7 - 30 days', 7 * DAY, 30 * DAY),
+    ('30 - 90 days', 30 * DAY, 90 * DAY),
+    ('90 days - 1 year', 90 * DAY, 365 * DAY),
+    ('1 - 3 years', 365 * DAY, 3 * 365 * DAY),
+    ('> 3 years', 3 * 365 * DAY, float('inf'))
+]
+
+# Десяткові інтервали [10^k, 10^(k+1)) як у stats / snapshot_store.get_log_bins;
+# показник -1 - порожні файли. Вісь фіксована, щоб матриці з різних джерел можна було додавати.
+LOG_EXPONENTS = list(range(-1, 19))
+
+SIZE_AXES = ('categories', 'log')
+TIME_KINDS = ('mtime', 'atime')
+
+
+class SizeAgeMatrix:
+    """
+    Двовимірний розподіл: інтервал розміру × віковий інтервал, окремо кількість файлів
+    і сумарний обсяг. Рядки - категорії з categories_diagram.CATEGORY_BORDERS або
+    десяткові логарифмічні інтервали, стовпці - AGE_BORDERS.
+
+    Вік рахується відносно фіксованого моменту now, тож матриці з однаковими now
+    і віссю розміру можна накопичувати потоково і зливати (merge) між собою.
+    """
+
+    def __init__(self, size_axis: str = 'categories', now: float = None):
+        if size_axis not in SIZE_AXES:
+            raise ValueError(f"Невідома вісь розміру: {size_axis}")
+        self.size_axis = size_axis
+        self.now = float(now if now is not None else time.time())
+        if size_axis == 'categories':
+            self.size_labels = [border[0] for border in CATEGORY_BORDERS]
+            self._size_bounds = None
+        else:
+            self.size_labels = ["0 B" if exponent < 0 else f"{10 ** exponent}-{10 ** (exponent + 1)}"
+                                for exponent in LOG_EXPONENTS]
+            self._size_bounds = np.array([10 ** exponent for exponent in LOG_EXPONENTS[1:]], dtype=np.int64)
+        self.age_labels = [border[0] for border in AGE_BORDERS]
+        self._age_bounds = np.array([border[2] for border in AGE_BORDERS[:-1]], dtype=np.float64)
+        self.counts = np.zeros((len(self.size_labels), len(self.age_labels)), dtype=np.int64)
+        self.bytes = np.zeros((len(self.size_labels), len(self.age_labels)), dtype=np.int64)
+
+    def consume(self, sizes, timestamps):
+        """
+        Додає частину файлів одним векторизованим проходом.
+
+        Args:
+            sizes (np.ndarray): Розміри файлів у байтах
+            timestamps (np.ndarray): Час (mtime або atime) у секундах Unix
+        """
+        sizes = np.asarray(sizes, dtype=np.int64)
+        ages = self.now - np.asarray(timestamps, dtype=np.float64)
+        if self._size_bounds is None:
+            size_indices = get_category_indices(sizes)
+        else:
+            size_indices = np.searchsorted(self._size_bounds, sizes, side='right')
+        age_indices = np.searchsorted(self._age_bounds, ages, side='right')
+        cells = size_indices * len(self.age_labels) + age_indices
+        self.counts += np.bincount(cells, minlength=self.counts.size).reshape(self.counts.shape)
+        np.add.at(self.bytes.reshape(-1), cells, sizes)
+
+    def merge(self, other: "SizeAgeMatrix") -> "SizeAgeMatrix":
+        """Додає іншу матрицю (наприклад, з іншого тому чи процесу) до цієї"""
+        if other.size_axis != self.size_axis or other.now != self.now:
+            raise ValueError("Зливати можна лише матриці з однаковою віссю розміру і моментом now")
+        self.counts += other.counts
+        self.bytes += other.bytes
+        return self
+
+    def get_size_totals(self) -> dict:
+        """Сума по вікових інтервалах - той самий розподіл, що дає categorize_file_sizes"""
+        return dict(zip(self.size_labels, self.counts.sum(axis=1).tolist()))
+
+    def to_dict(self) -> dict:
+        """Опис для JSON (контрольні точки, передача між машинами)"""
+        return {"size_axis": self.size_axis, "now": self.now,
+                "counts": self.counts.tolist(), "bytes": self.bytes.tolist()}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "SizeAgeMatrix":
+        matrix = cls(data["size_axis"], data["now"])
+        matrix.counts = np.array(data["counts"], dtype=np.int64)
+        matrix.bytes = np.array(data["bytes"], dtype=np.int64)
+        return matrix
+
+
+class SizeAgeStage:
+    """
+    Етап для stream_ingest.ingest: матриці розмір × вік для mtime і atime
+    з обома осями розміру. Потребує формату з часами (find-times або csv-times).
+    """
+
+    def __init__(self, now: float = None):
+        now = float(now if now is not None else time.time())
+        self.matrices = {(kind, axis): SizeAgeMatrix(axis, now) for kind in TIME_KINDS for axis in SIZE_AXES}
+
+    def consume_timed(self, sizes, mtimes, atimes):
+        times = {'mtime': mtimes, 'atime': atimes}
+        for (kind, _), matrix in self.matrices.items():
+            matrix.consume(sizes, times[kind])
+
+    def finish(self) -> dict:
+        return self.matrices
+
+
+def get_size_age_matrices(filename: str, now: float = None, chunk_size: int = 1 << 20) -> dict:
+    """
+    Будує матриці розмір × вік з CSV "path,mtime,atime,size" (scanner.py з keep_times),
+    читаючи його частинами по chunk_size рядків.
+
+    Returns:
+        dict: {(вид часу, вісь розміру): SizeAgeMatrix}
+    """
+    stage = SizeAgeStage(now)
+    records = []
+    for record in fh.iter_timed_records(filename):
+        records.append(record)
+        if len(records) >= chunk_size:
+            _consume_records(stage, records)
+            records = []
+    if records:
+        _consume_records(stage, records)
+    return stage.finish()
+
+
+def _consume_records(stage: SizeAgeStage, records: list[tuple[int, float, float]]):
+    sizes, mtimes, atimes = zip(*records)
+    stage.consume_timed(np.array(sizes, dtype=np.int64), np.array(mtimes), np.array(atimes))
+
+
+def print_size_age_matrix(matrix: SizeAgeMatrix, value: str = 'counts'):
+    """Виводить матрицю таблицею: value - 'counts' (кількість файлів) або 'bytes' (обсяг)"""
+    table = matrix.counts if value == 'counts' else matrix.bytes
+    label_width = max(len(label) for label, row in zip(matrix.size_labels, table) if row.any()) if table.any() else 0
+    column_widths = [max(len(label), len(f"{table[:, index].max():,}")) for index, label in enumerate(matrix.age_labels)]
+    print(" " * label_width + " | " + " | ".join(label.rjust(width) for label, width in zip(matrix.age_labels, column_widths)))
+    for row, label in zip(table, matrix.size_labels):
+        if row.any():
+            print(label.ljust(label_width) + " | " + " | ".join(f"{cell:,}".rjust(width) for cell, width in zip(row, column_widths)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Розподіл файлів за розміром і віком з CSV path,mtime,atime,size")
+    parser.add_argument('filename')
+    parser.add_argument('--time', choices=TIME_KINDS, default='mtime')
+    parser.add_argument('--axis', choices=SIZE_AXES, default='categories')
+    args = parser.parse_args()
+
+    matrix = get_size_age_matrices(args.filename)[(args.time, args.axis)]
+    print(f"\nКількість файлів ({args.time}):")
+    print_size_age_matrix(matrix, 'counts')
+    print(f"\nОбсяг у байтах ({args.time}):")
+    print_size_age_matrix(matrix, 'bytes')
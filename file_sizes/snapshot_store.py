@@ -0,0 +1,251 @@
+import argparse
+import math
+import os
+import sqlite3
+import time
+
+import numpy as np
+
+import file_helper as fh
+import stats
+import two_pointers_for_quantity as tpq
+import two_pointers_technique as tp
+from categories_diagram import CATEGORY_BORDERS
+from range_index import RangeIndex
+
+# Стандартні коефіцієнти переважної більшості, для яких зберігаються інтервали
+STANDARD_COEFFS = (0.5, 0.8, 0.9, 0.95, 0.99)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id INTEGER PRIMARY KEY,
+    host TEXT NOT NULL,
+    path TEXT NOT NULL,
+    taken_at REAL NOT NULL,
+    source TEXT
+);
+CREATE INDEX IF NOT EXISTS snapshots_by_location ON snapshots (host, path, taken_at);
+
+CREATE TABLE IF NOT EXISTS stats (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    name TEXT NOT NULL,
+    value REAL
+);
+CREATE INDEX IF NOT EXISTS stats_by_name ON stats (name, snapshot_id);
+
+CREATE TABLE IF NOT EXISTS categories (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    category TEXT NOT NULL,
+    file_count INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS categories_by_name ON categories (category, snapshot_id);
+
+CREATE TABLE IF NOT EXISTS log_bins (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    exponent INTEGER NOT NULL,
+    file_count INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS log_bins_by_exponent ON log_bins (exponent, snapshot_id);
+
+CREATE TABLE IF NOT EXISTS majority (
+    snapshot_id INTEGER NOT NULL REFERENCES snapshots (id),
+    kind TEXT NOT NULL,
+    coeff REAL NOT NULL,
+    lower_size INTEGER NOT NULL,
+    upper_size INTEGER NOT NULL,
+    file_count INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS majority_by_kind ON majority (kind, coeff, snapshot_id);
+"""
+
+
+def get_log_bins(values, counts) -> list[tuple[int, int, int]]:
+    """
+    Логарифмічна гістограма з десятковими інтервалами [10^k, 10^(k+1)), як у stats.
+    Порожні файли потрапляють в інтервал з показником -1.
+
+    Returns:
+        list: Кортежі (показник k, кількість файлів, сумарний обсяг)
+    """
+    values = np.asarray(values, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.int64)
+    exponents = np.full(len(values), -1, dtype=np.int64)
+    positive = values > 0
+    exponents[positive] = np.floor(np.log10(values[positive])).astype(np.int64)
+
+    result = []
+    for exponent in np.unique(exponents):
+        selected = exponents == exponent
+        result.append((int(exponent), int(counts[selected].sum()), int((values[selected] * counts[selected]).sum())))
+    return result
+
+
+def get_majority_intervals(values, counts, coeffs=STANDARD_COEFFS) -> list[tuple]:
+    """
+    Інтервали переважної більшості всіх трьох типів для заданих коефіцієнтів.
+
+    Returns:
+        list: Кортежі (тип, коефіцієнт, нижній розмір, верхній розмір, кількість файлів, обсяг)
+    """
+    count_preffix, bytes_preffix = tp.create_weighted_preffix_sums(values, counts)
+    searches = {
+        'count': tp.get_weighted_interval_with_min_count,
+        'range': tp.get_weighted_interval_with_min_range,
+        'borders': tpq.get_weighted_interval_with_min_borders
+    }
+
+    result = []
+    for kind, search in searches.items():
+        for coeff in coeffs:
+            l, r = search(values, counts, coeff)
+            interval_bytes = (tp.get_weighted_sum(values, count_preffix, bytes_preffix, r)
+                              - tp.get_weighted_sum(values, count_preffix, bytes_preffix, l - 1))
+            result.append((kind, coeff,
+                           tp.get_size_at(values, count_preffix, l), tp.get_size_at(values, count_preffix, r),
+                           r - l + 1, int(interval_bytes)))
+    return result
+
+
+class SnapshotStore:
+    """
+    Сховище агрегатів по знімках: статистика, категорії, логарифмічна гістограма та інтервали
+    переважної більшості. Кожен агрегат лежить в окремій таблиці з індексом (показник, знімок),
+    тому запит тренду читає лише рядки одного показника і не торкається сирих даних.
+    """
+
+    def __init__(self, db_filename: str):
+        self.connection = sqlite3.connect(db_filename)
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def add_snapshot(self, values, counts, host: str, path: str, taken_at: float = None, source: str = None) -> int:
+        """
+        Обчислює агрегати для стиснутого знімка (унікальні розміри, кількості) і дописує їх у сховище.
+
+        Returns:
+            int: Ідентифікатор доданого знімка
+        """
+        if len(values) == 0:
+            raise ValueError("Знімок порожній")
+        taken_at = time.time() if taken_at is None else taken_at
+        index = RangeIndex.build(values, counts)
+
+        file_stats = stats.get_weighted_file_statistics(values, counts)
+        stat_rows = [(name, float(value)) for name, value in file_stats.items()
+                     if isinstance(value, (int, float, np.integer, np.floating)) and math.isfinite(value)]
+
+        lower = [border[1] for border in CATEGORY_BORDERS]
+        upper = [border[2] for border in CATEGORY_BORDERS]
+        category_ranges = index.query(lower, upper)
+        category_rows = [(name, int(count), int(size)) for (name, _, _), count, size
+                         in zip(CATEGORY_BORDERS, category_ranges["counts"], category_ranges["bytes"])]
+
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO snapshots (host, path, taken_at, source) VALUES (?, ?, ?, ?)",
+                (host, path, taken_at, source))
+            snapshot_id = cursor.lastrowid
+            self.connection.executemany("INSERT INTO stats VALUES (?, ?, ?)",
+                                        [(snapshot_id, *row) for row in stat_rows])
+            self.connection.executemany("INSERT INTO categories VALUES (?, ?, ?, ?)",
+                                        [(snapshot_id, *row) for row in category_rows])
+            self.connection.executemany("INSERT INTO log_bins VALUES (?, ?, ?, ?)",
+                                        [(snapshot_id, *row) for row in get_log_bins(values, counts)])
+            self.connection.executemany("INSERT INTO majority VALUES (?, ?, ?, ?, ?, ?, ?)",
+                                        [(snapshot_id, *row) for row in get_majority_intervals(values, counts)])
+        return snapshot_id
+
+    def add_snapshot_file(self, filename: str, host: str, path: str, taken_at: float = None) -> int:
+        """Додає знімок з CSV-файлу; час знімка за замовчуванням - час зміни файлу"""
+        values, counts = fh.get_size_counts(filename)
+        taken_at = os.path.getmtime(filename) if taken_at is None else taken_at
+        return self.add_snapshot(values, counts, host, path, taken_at, source=filename)
+
+    def get_snapshots(self, host: str = None, path: str = None, since: float = None, until: float = None) -> list[tuple]:
+        """Список знімків (id, host, path, taken_at, source) у хронологічному порядку"""
+        where, params = self._get_filter(host, path, since, until)
+        return self.connection.execute(
+            f"SELECT id, host, path, taken_at, source FROM snapshots s WHERE {where} ORDER BY taken_at", params).fetchall()
+
+    def get_stat_trend(self, name: str, host: str = None, path: str = None, since: float = None, until: float = None) -> list[tuple]:
+        """Значення показника з get_file_statistics у часі: (taken_at, value)"""
+        where, params = self._get_filter(host, path, since, until)
+        return self.connection.execute(
+            f"SELECT s.taken_at, t.value FROM stats t JOIN snapshots s ON s.id = t.snapshot_id "
+            f"WHERE t.name = ? AND {where} ORDER BY s.taken_at", [name] + params).fetchall()
+
+    def get_category_trend(self, category: str, host: str = None, path: str = None, since: float = None, until: float = None) -> list[tuple]:
+        """Кількість файлів і обсяг категорії у часі: (taken_at, file_count, bytes)"""
+        where, params = self._get_filter(host, path, since, until)
+        return self.connection.execute(
+            f"SELECT s.taken_at, c.file_count, c.bytes FROM categories c JOIN snapshots s ON s.id = c.snapshot_id "
+            f"WHERE c.category = ? AND {where} ORDER BY s.taken_at", [category] + params).fetchall()
+
+    def get_log_bin_trend(self, exponent: int, host: str = None, path: str = None, since: float = None, until: float = None) -> list[tuple]:
+        """Кількість файлів і обсяг інтервалу [10^k, 10^(k+1)) у часі: (taken_at, file_count, bytes)"""
+        where, params = self._get_filter(host, path, since, until)
+        return self.connection.execute(
+            f"SELECT s.taken_at, b.file_count, b.bytes FROM log_bins b JOIN snapshots s ON s.id = b.snapshot_id "
+            f"WHERE b.exponent = ? AND {where} ORDER BY s.taken_at", [exponent] + params).fetchall()
+
+    def get_majority_trend(self, kind: str, coeff: float, host: str = None, path: str = None, since: float = None, until: float = None) -> list[tuple]:
+        """Інтервал переважної більшості у часі: (taken_at, lower_size, upper_size, file_count, bytes)"""
+        where, params = self._get_filter(host, path, since, until)
+        return self.connection.execute(
+            f"SELECT s.taken_at, m.lower_size, m.upper_size, m.file_count, m.bytes FROM majority m "
+            f"JOIN snapshots s ON s.id = m.snapshot_id "
+            f"WHERE m.kind = ? AND m.coeff = ? AND {where} ORDER BY s.taken_at", [kind, coeff] + params).fetchall()
+
+    def _get_filter(self, host, path, since, until):
+        conditions, params = ["1 = 1"], []
+        for condition, value in (("s.host = ?", host), ("s.path = ?", path),
+                                 ("s.taken_at >= ?", since), ("s.taken_at <= ?", until)):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+        return " AND ".join(conditions), params
+
+
+def get_growth(trend: list[tuple], column: int = 1):
+    """Зміна значення між першим і останнім знімком тренду (абсолютна та у відсотках)"""
+    if len(trend) < 2:
+        return 0, 0.0
+    first, last = trend[0][column], trend[-1][column]
+    return last - first, (last - first) / first * 100 if first else float('inf')
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Сховище агрегатів історичних знімків розмірів файлів")
+    parser.add_argument('--db', default="file_size_history.sqlite")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    add_parser = subparsers.add_parser('add', help="Додати знімок з CSV")
+    add_parser.add_argument('filename')
+    add_parser.add_argument('--host', default=os.uname().nodename)
+    add_parser.add_argument('--path', default='/')
+    add_parser.add_argument('--taken-at', type=float, default=None)
+
+    trend_parser = subparsers.add_parser('category-trend', help="Тренд категорії за останні дні")
+    trend_parser.add_argument('category')
+    trend_parser.add_argument('--host', default=None)
+    trend_parser.add_argument('--path', default=None)
+    trend_parser.add_argument('--days', type=float, default=90)
+
+    args = parser.parse_args()
+    store = SnapshotStore(args.db)
+    if args.command == 'add':
+        snapshot_id = store.add_snapshot_file(args.filename, args.host, args.path, args.taken_at)
+        print(f"Додано знімок #{snapshot_id}")
+    else:
+        trend = store.get_category_trend(args.category, args.host, args.path, since=time.time() - args.days * 86400)
+        for taken_at, file_count, size in trend:
+            print(f"{time.strftime('%Y-%m-%d %H:%M', time.localtime(taken_at))}: {file_count} файлів, {size} байт")
+        count_growth, count_percent = get_growth(trend, 1)
+        size_growth, size_percent = get_growth(trend, 2)
+        print(f"Зміна: {count_growth:+} файлів ({count_percent:+.2f}%), {size_growth:+} байт ({size_percent:+.2f}%)")
+    store.close()
@@ -1,59 +1,181 @@
 import numpy as np
-from collections import Counter
 import math
+from concurrent.futures import ThreadPoolExecutor
 import matplotlib.pyplot as plt
-from scipy import stats
+import file_helper as fh
 
-def get_file_statistics(input_list):
+def get_file_statistics(input_list, workers=None):
     """
     Обчислює різні статистичні показники для розмірів файлів.
     
     Args:
         input_list (list): Список розмірів файлів у байтах
+        workers (int): Кількість потоків для стиснення і часткових сум
+                       (за замовчуванням - кількість ядер, 1 - без потоків)
         
     Returns:
         dict: Словник зі статистичними показниками
     """
-    if not input_list or len(input_list) == 0:
+    if input_list is None or len(input_list) == 0:
         return {"error": "Список розмірів файлів порожній"}
     
-    # Конвертуємо у numpy масив для ефективніших обчислень
-    sizes = np.array(input_list)
-    total_size = np.sum(sizes)
+    # Стискаємо у пари (унікальний розмір, кількість) - далі все рахується по унікальних розмірах
+    values, counts = fh.compress_sizes(input_list, workers)
+    return get_weighted_file_statistics(values, counts, workers)
+
+def _get_weighted_percentiles(values, count_preffix, percents):
+    """
+    Перцентилі з лінійною інтерполяцією (як np.percentile) для стиснутого представлення.
+    Усі перцентилі шукаються одним searchsorted по спільних префіксних сумах.
+    """
+    file_count = int(count_preffix[-1])
+    positions = np.asarray(percents, dtype=np.float64) / 100 * (file_count - 1)
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.minimum(lower + 1, file_count - 1)
+    groups = np.searchsorted(count_preffix, np.concatenate((lower, upper)), side='right') - 1
+    lower_values, upper_values = values[groups[:len(lower)]], values[groups[len(lower):]]
+    return lower_values + (upper_values - lower_values) * (positions - lower)
+
+def _get_weighted_percentile(values, count_preffix, percent):
+    """Перцентиль з лінійною інтерполяцією (як np.percentile) для стиснутого представлення"""
+    return _get_weighted_percentiles(values, count_preffix, [percent])[0]
+
+def _split_groups(length, workers):
+    """Межі частин (початок, кінець) для паралельної обробки груп"""
+    bounds = np.linspace(0, length, max(1, min(workers, length)) + 1).astype(np.int64)
+    return list(zip(bounds[:-1].tolist(), bounds[1:].tolist()))
+
+def _map_chunks(function, chunks, workers):
+    """Виконує function(*chunk) для кожної частини; NumPy відпускає GIL, тож потоки працюють паралельно"""
+    if workers <= 1 or len(chunks) <= 1:
+        return [function(*chunk) for chunk in chunks]
+    with ThreadPoolExecutor(workers) as pool:
+        return list(pool.map(lambda chunk: function(*chunk), chunks))
+
+def _get_parallel_preffix_sums(values, counts, workers):
+    """
+    Префіксні суми кількостей і байтів: кожна частина рахує локальні суми,
+    а потім зсувається на сумарні значення попередніх частин.
+    """
+    count_preffix = np.zeros(len(values) + 1, dtype=np.int64)
+    bytes_preffix = np.zeros(len(values) + 1, dtype=np.int64)
+    groups = _split_groups(len(values), workers)
+    
+    def local_sums(start, end):
+        np.cumsum(counts[start:end], out=count_preffix[start + 1:end + 1])
+        np.cumsum(values[start:end] * counts[start:end], out=bytes_preffix[start + 1:end + 1])
+    _map_chunks(local_sums, groups, workers)
+    
+    count_offsets = np.cumsum([0] + [int(count_preffix[end]) for _, end in groups[:-1]])
+    bytes_offsets = np.cumsum([0] + [int(bytes_preffix[end]) for _, end in groups[:-1]])
+    
+    def shift(index, start, end):
+        count_preffix[start + 1:end + 1] += count_offsets[index]
+        bytes_preffix[start + 1:end + 1] += bytes_offsets[index]
+    _map_chunks(shift, [(index, start, end) for index, (start, end) in enumerate(groups) if index > 0], workers)
+    return count_preffix, bytes_preffix
+
+def _get_chunk_reductions(values, counts, bytes_before, mean_size, size_ranges):
+    """
+    Суми по одній частині груп, які для всього набору просто додаються:
+    центральні моменти 2-4 порядку за один прохід, сума накопичених обсягів
+    (для коефіцієнта Джині), сума логарифмів і логарифмічна гістограма.
+    """
+    deviations = values - mean_size
+    squared = deviations ** 2
+    weighted_squared = counts * squared
+    # Для групи з c файлів розміру v накопичений обсяг - це c * (обсяг до групи) + v * c * (c + 1) / 2;
+    # c * (c + 1) переповнює int64 вже при c ~ 3e9, тож рахуємо у float64
+    float_counts = counts.astype(np.float64)
+    cum_sum = np.sum(float_counts * bytes_before.astype(np.float64) + values * (float_counts * (float_counts + 1) / 2))
+    if size_ranges is None:
+        log_sum, bin_counts = 0.0, None
+    else:
+        log_sum = np.sum(counts * np.log(values))
+        bin_counts = np.bincount(np.digitize(values, size_ranges), weights=counts, minlength=len(size_ranges) + 1)
+    return np.array([np.sum(weighted_squared), np.sum(weighted_squared * deviations),
+                     np.sum(weighted_squared * squared), cum_sum, log_sum]), bin_counts
+
+def get_weighted_file_statistics(values, counts, workers=None):
+    """
+    Обчислює ті ж показники, що й get_file_statistics, але для стиснутого
+    представлення: пам'ять і час залежать від кількості унікальних розмірів.
+    
+    Проміжні результати спільні для всіх показників: префіксні суми дають усі
+    квантилі, частку менших за середнє і кількість викидів, а решта рахується
+    одним проходом по частинах груп, які обробляються у пулі з workers потоків.
+    
+    Args:
+        values (np.ndarray): Відсортовані унікальні розміри файлів у байтах
+        counts (np.ndarray): Кількість файлів кожного розміру
+        workers (int): Кількість потоків (за замовчуванням - кількість ядер, 1 - без потоків)
+        
+    Returns:
+        dict: Словник зі статистичними показниками
+    """
+    if len(values) == 0:
+        return {"error": "Список розмірів файлів порожній"}
+    
+    values = np.asarray(values, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.int64)
+    workers = fh.DEFAULT_WORKERS if workers is None else workers
+    if len(values) < fh.PARALLEL_MIN_LENGTH:
+        workers = 1
+    count_preffix, bytes_preffix = _get_parallel_preffix_sums(values, counts, workers)
+    file_count = int(count_preffix[-1])
+    total_size = bytes_preffix[-1]
+    mean_size = total_size / file_count
+    q1_size, median_size, q3_size = _get_weighted_percentiles(values, count_preffix, [25, 50, 75])
+    
+    # Логарифмічні інтервали для частотного аналізу (лише коли всі розміри додатні)
+    if values[0] > 0:
+        min_log = np.floor(np.log10(values[0]))
+        max_log = np.ceil(np.log10(values[-1]))
+        log_bins = np.arange(min_log, max_log + 1)
+        size_ranges = 10 ** log_bins
+    else:
+        size_ranges = None
+    
+    # Один паралельний прохід по частинах груп
+    chunk_results = _map_chunks(
+        lambda start, end: _get_chunk_reductions(values[start:end], counts[start:end],
+                                                 bytes_preffix[start:end], mean_size, size_ranges),
+        _split_groups(len(values), workers), workers)
+    moment_2, moment_3, moment_4, cum_sum_total, log_sum = np.sum([sums for sums, _ in chunk_results], axis=0)
+    moment_2, moment_3, moment_4 = moment_2 / file_count, moment_3 / file_count, moment_4 / file_count
     
     # Базові статистичні показники
     stats_dict = {
         # Абсолютні розміри
         "total_size": total_size,
-        "min_size": np.min(sizes),
-        "max_size": np.max(sizes),
-        "mean_size": np.mean(sizes),
-        "median_size": np.median(sizes),
+        "min_size": values[0],
+        "max_size": values[-1],
+        "mean_size": mean_size,
+        "median_size": median_size,
         
         # Відносні розміри
-        "min_relative_size": np.min(sizes) / total_size if total_size > 0 else 0,
-        "max_relative_size": np.max(sizes) / total_size if total_size > 0 else 0,
+        "min_relative_size": values[0] / total_size if total_size > 0 else 0,
+        "max_relative_size": values[-1] / total_size if total_size > 0 else 0,
         
         # Загальна кількість
-        "file_count": len(sizes)
+        "file_count": file_count
     }
     
     # Знаходимо моду (найбільш поширений розмір)
-    counter = Counter(sizes)
-    mode_value, mode_count = counter.most_common(1)[0] if counter else (None, 0)
-    stats_dict["mode_size"] = mode_value
-    stats_dict["mode_frequency"] = mode_count
-    stats_dict["mode_percentage"] = (mode_count / len(sizes)) * 100 if len(sizes) > 0 else 0
+    mode_index = int(np.argmax(counts))
+    stats_dict["mode_size"] = values[mode_index]
+    stats_dict["mode_frequency"] = int(counts[mode_index])
+    stats_dict["mode_percentage"] = (counts[mode_index] / file_count) * 100
     
     # Додаткові статистичні показники
     
     # Стандартне відхилення і дисперсія
-    stats_dict["std_dev"] = np.std(sizes)
-    stats_dict["variance"] = np.var(sizes)
+    stats_dict["variance"] = moment_2
+    stats_dict["std_dev"] = np.sqrt(moment_2)
     
     # Квартилі розподілу
-    stats_dict["q1_size"] = np.percentile(sizes, 25)  # Перший квартиль (25%)
-    stats_dict["q3_size"] = np.percentile(sizes, 75)  # Третій квартиль (75%)
+    stats_dict["q1_size"] = q1_size  # Перший квартиль (25%)
+    stats_dict["q3_size"] = q3_size  # Третій квартиль (75%)
     
     # Міжквартильний діапазон (IQR)
     stats_dict["iqr"] = stats_dict["q3_size"] - stats_dict["q1_size"]
@@ -61,39 +183,49 @@ def get_file_statistics(input_list):
     # Коефіцієнт варіації (CV)
     stats_dict["cv"] = (stats_dict["std_dev"] / stats_dict["mean_size"]) * 100 if stats_dict["mean_size"] > 0 else 0
     
-    # Коефіцієнт асиметрії (skewness)
-    stats_dict["skewness"] = stats.skew(sizes) if len(sizes) > 2 else 0
-    
-    # Коефіцієнт ексцесу (kurtosis)
-    stats_dict["kurtosis"] = stats.kurtosis(sizes) if len(sizes) > 3 else 0
+    # Коефіцієнт асиметрії (skewness) та ексцесу (kurtosis), як у scipy.stats з bias=True
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stats_dict["skewness"] = moment_3 / moment_2 ** 1.5 if file_count > 2 else 0
+        stats_dict["kurtosis"] = moment_4 / moment_2 ** 2 - 3 if file_count > 3 else 0
     
     # Глобальний коефіцієнт нерівномірності файлових розмірів (аналог коефіцієнта Джині)
     # Цей коефіцієнт показує, наскільки нерівномірно розподілений дисковий простір
     # 0 означає рівномірний розподіл, 1 - максимальна нерівномірність
-    sorted_sizes = np.sort(sizes)
-    cum_sizes = np.cumsum(sorted_sizes)
-    cum_proportions = cum_sizes / total_size if total_size > 0 else np.zeros_like(cum_sizes)
+    # Сума накопичених обсягів по всіх файлах (cum_sum_total) вже пораховано по частинах
+    if total_size > 0:
+        cum_proportions_sum = cum_sum_total / total_size
+        first_proportion, last_proportion = values[0] / total_size, 1.0
+    else:
+        cum_proportions_sum, first_proportion, last_proportion = 0.0, 0.0, 0.0
     
-    # Обчислення площі під кривою Лоренца (використовуємо метод трапецій)
-    lorenz_area = np.trapz(cum_proportions, dx=1/len(sizes))
+    # Обчислення площі під кривою Лоренца (метод трапецій з кроком 1/n)
+    lorenz_area = (cum_proportions_sum - (first_proportion + last_proportion) / 2) / file_count
     
     # Коефіцієнт Джині: 2 * (0.5 - площа під кривою Лоренца)
     stats_dict["gini_coefficient"] = 2 * (0.5 - lorenz_area)
     
     # Паретівський аналіз: який відсоток файлів займає 80% загального простору
-    pareto_threshold_index = np.searchsorted(cum_proportions, 0.8)
-    stats_dict["pareto_threshold"] = pareto_threshold_index / len(sizes) if len(sizes) > 0 else 0
+    if total_size > 0:
+        pareto_target = 0.8 * total_size
+        group = int(np.searchsorted(bytes_preffix, pareto_target, side='left')) - 1
+        group = max(group, 0)
+        inside = math.ceil((pareto_target - bytes_preffix[group]) / values[group]) if values[group] > 0 else 0
+        pareto_threshold_index = int(count_preffix[group]) + max(inside, 1) - 1
+    else:
+        pareto_threshold_index = file_count
+    stats_dict["pareto_threshold"] = pareto_threshold_index / file_count
     
     # Додаємо відсоток файлів, розмір яких менший за середній
-    stats_dict["percent_below_mean"] = np.mean(sizes < stats_dict["mean_size"]) * 100
+    below_mean = int(np.searchsorted(values, mean_size, side='left'))
+    stats_dict["percent_below_mean"] = count_preffix[below_mean] / file_count * 100
     
     # Додаємо відсоток файлів, розмір яких менший за медіану
     stats_dict["percent_below_median"] = 50.0  # За визначенням медіани
     
     # Додаємо геометричне середнє (корисно для даних з великим розкидом)
     # Використовуємо логарифмічне перетворення для стабільності обчислень
-    if np.all(sizes > 0):  # Геометричне середнє визначене лише для додатних чисел
-        stats_dict["geometric_mean"] = np.exp(np.mean(np.log(sizes)))
+    if values[0] > 0:  # Геометричне середнє визначене лише для додатних чисел
+        stats_dict["geometric_mean"] = np.exp(log_sum / file_count)
     else:
         stats_dict["geometric_mean"] = None
     
@@ -104,33 +236,26 @@ def get_file_statistics(input_list):
     lower_bound = stats_dict["q1_size"] - 1.5 * stats_dict["iqr"]
     upper_bound = stats_dict["q3_size"] + 1.5 * stats_dict["iqr"]
     
-    outliers = sizes[(sizes < lower_bound) | (sizes > upper_bound)]
-    stats_dict["outlier_count"] = len(outliers)
-    stats_dict["outlier_percentage"] = (len(outliers) / len(sizes)) * 100 if len(sizes) > 0 else 0
+    below = int(np.searchsorted(values, lower_bound, side='left'))
+    above = int(np.searchsorted(values, upper_bound, side='right'))
+    outlier_count = int(count_preffix[below] + file_count - count_preffix[above])
+    stats_dict["outlier_count"] = outlier_count
+    stats_dict["outlier_percentage"] = (outlier_count / file_count) * 100
     
     # Частотний аналіз: розподіл файлів за розмірами у логарифмічних інтервалах
     # Це дає уявлення про кластеризацію файлів за розмірами
-    if np.all(sizes > 0):
-        log_sizes = np.log10(sizes)
-        min_log = np.floor(np.min(log_sizes))
-        max_log = np.ceil(np.max(log_sizes))
-        
-        # Створюємо логарифмічні інтервали
-        log_bins = np.arange(min_log, max_log + 1)
-        size_ranges = 10 ** log_bins
-        
-        # Підраховуємо кількість файлів у кожному інтервалі
-        bin_indices = np.digitize(sizes, size_ranges)
-        size_distribution = dict(Counter(bin_indices))
+    if size_ranges is not None:
+        # Кількість файлів у кожному інтервалі (з вагами груп), зібрана з частин
+        bin_counts = np.sum([bins for _, bins in chunk_results], axis=0)
         
         # Перетворюємо на зручний формат для інтерпретації
         formatted_distribution = {}
-        for idx, count in size_distribution.items():
+        for idx in np.flatnonzero(bin_counts):
             if idx > 0 and idx <= len(size_ranges):
                 lower = size_ranges[idx-1]
                 upper = size_ranges[idx] if idx < len(size_ranges) else float('inf')
                 key = f"{lower:.0f}-{upper:.0f}" if upper != float('inf') else f"{lower:.0f}+"
-                formatted_distribution[key] = count
+                formatted_distribution[key] = int(bin_counts[idx])
                 
         stats_dict["size_distribution"] = formatted_distribution
     
@@ -250,26 +375,52 @@ def plot_file_size_statistics(input_list, title="Статистика розмі
     Returns:
         matplotlib.figure.Figure: Об'єкт фігури з графіками
     """
-    if not input_list or len(input_list) == 0:
+    if input_list is None or len(input_list) == 0:
+        print("Список розмірів файлів порожній")
+        return None
+    
+    values, counts = fh.compress_sizes(input_list)
+    return plot_weighted_file_size_statistics(values, counts, title)
+
+def plot_weighted_file_size_statistics(values, counts, title="Статистика розмірів файлів"):
+    """
+    Створює набір графіків для стиснутого представлення (унікальні розміри, кількості).
+    
+    Args:
+        values (np.ndarray): Відсортовані унікальні розміри файлів у байтах
+        counts (np.ndarray): Кількість файлів кожного розміру
+        title (str): Заголовок для графіків
+        
+    Returns:
+        matplotlib.figure.Figure: Об'єкт фігури з графіками
+    """
+    if len(values) == 0:
         print("Список розмірів файлів порожній")
         return None
         
     fig, axs = plt.subplots(2, 2, figsize=(14, 10))
     fig.suptitle(title, fontsize=16)
     
-    sizes = np.array(input_list)
+    values = np.asarray(values, dtype=np.int64)
+    counts = np.asarray(counts, dtype=np.int64)
+    count_preffix = np.concatenate(([0], np.cumsum(counts)))
+    bytes_preffix = np.concatenate(([0], np.cumsum(values * counts)))
+    file_count = int(count_preffix[-1])
+    total_size = bytes_preffix[-1]
+    mean_size = total_size / file_count
+    median_size = _get_weighted_percentile(values, count_preffix, 50)
     
     # 1. Гістограма розподілу розмірів (з логарифмічною шкалою для осі X)
-    if np.all(sizes > 0):  # Уникаємо помилок з логарифмічною шкалою
+    if values[0] > 0:  # Уникаємо помилок з логарифмічною шкалою
         ax = axs[0, 0]
         # Використовуємо логарифмічну шкалу для кращого відображення
-        log_sizes = np.log10(sizes)
+        log_sizes = np.log10(values)
         min_log = np.floor(np.min(log_sizes))
         max_log = np.ceil(np.max(log_sizes))
         log_bins = np.linspace(min_log, max_log, min(50, int(max_log - min_log + 1) * 5))
         bins = 10 ** log_bins
         
-        hist, bin_edges = np.histogram(sizes, bins=bins)
+        hist, bin_edges = np.histogram(values, bins=bins, weights=counts)
         widths = np.diff(bin_edges)
         
         ax.bar(bin_edges[:-1], hist, width=widths, align='edge', alpha=0.7)
@@ -279,35 +430,45 @@ def plot_file_size_statistics(input_list, title="Статистика розмі
         ax.set_ylabel('Кількість файлів')
         
         # Додаємо вертикальні лінії для середнього та медіанного значень
-        ax.axvline(np.mean(sizes), color='r', linestyle='--', label=f'Середнє: {np.mean(sizes):.1f}')
-        ax.axvline(np.median(sizes), color='g', linestyle='-.', label=f'Медіана: {np.median(sizes):.1f}')
+        ax.axvline(mean_size, color='r', linestyle='--', label=f'Середнє: {mean_size:.1f}')
+        ax.axvline(median_size, color='g', linestyle='-.', label=f'Медіана: {median_size:.1f}')
         
         # Додаємо легенду
         ax.legend()
     
-    # 2. Boxplot (коробка з вусами) для розмірів
+    # 2. Boxplot (коробка з вусами) для розмірів - будуємо з готових квартилів
     ax = axs[0, 1]
-    ax.boxplot(sizes, vert=False, showfliers=False)  # Не показуємо викиди для кращої читабельності
+    q1 = _get_weighted_percentile(values, count_preffix, 25)
+    q3 = _get_weighted_percentile(values, count_preffix, 75)
+    iqr = q3 - q1
+    box = {
+        'med': median_size,
+        'q1': q1,
+        'q3': q3,
+        'whislo': values[values >= q1 - 1.5 * iqr].min(),
+        'whishi': values[values <= q3 + 1.5 * iqr].max(),
+        'fliers': []
+    }
+    ax.bxp([box], vert=False, showfliers=False)  # Не показуємо викиди для кращої читабельності
     ax.set_title('Коробка з вусами (без викидів)')
     ax.set_xlabel('Розмір файлу (байти)')
     ax.set_xscale('log')
     ax.grid(True, alpha=0.3)
     
     # 3. Крива Лоренца (показує нерівномірність розподілу)
+    # Між межами груп однакових розмірів крива лінійна, тож достатньо точок на межах
     ax = axs[1, 0]
-    sorted_sizes = np.sort(sizes)
-    cum_sizes = np.cumsum(sorted_sizes)
-    cum_proportions = cum_sizes / np.sum(sizes)
+    file_proportions = count_preffix / file_count
+    cum_proportions = bytes_preffix / total_size if total_size > 0 else np.zeros(len(bytes_preffix))
     
     # Лінія ідеально рівномірного розподілу
     ax.plot([0, 1], [0, 1], 'k--', label='Рівномірний розподіл')
     
     # Фактична крива Лоренца
-    ax.plot(np.linspace(0, 1, len(sizes)), cum_proportions, label='Фактичний розподіл')
+    ax.plot(file_proportions, cum_proportions, label='Фактичний розподіл')
     
     # Заповнюємо область між кривими
-    ax.fill_between(np.linspace(0, 1, len(sizes)), np.linspace(0, 1, len(sizes)), 
-                    cum_proportions, alpha=0.2)
+    ax.fill_between(file_proportions, file_proportions, cum_proportions, alpha=0.2)
     
     ax.set_title('Крива Лоренца (нерівномірність розмірів)')
     ax.set_xlabel('Накопичена частка файлів')
@@ -318,16 +479,16 @@ def plot_file_size_statistics(input_list, title="Статистика розмі
     # 4. Топ-5 найбільших файлів (у відсотках від загального розміру)
     ax = axs[1, 1]
     
-    # Сортуємо розміри за спаданням і беремо топ-5
-    top_sizes = np.sort(sizes)[::-1][:min(5, len(sizes))]
-    top_percentages = top_sizes / np.sum(sizes) * 100
+    # Беремо топ-5 з кінця стиснутого представлення
+    top_sizes = np.repeat(values[-5:], counts[-5:])[::-1][:min(5, file_count)]
+    top_percentages = top_sizes / total_size * 100
     
     # Додаємо решту файлів як одну категорію
-    if len(sizes) > 5:
+    if file_count > 5:
         rest_percentage = 100 - np.sum(top_percentages)
         labels = [f'Файл #{i+1}: {size:.1f} байт ({pct:.2f}%)' 
                  for i, (size, pct) in enumerate(zip(top_sizes, top_percentages))]
-        labels.append(f'Інші файли ({len(sizes)-5:,}): {rest_percentage:.2f}%')
+        labels.append(f'Інші файли ({file_count-5:,}): {rest_percentage:.2f}%')
         sizes_to_plot = np.append(top_percentages, rest_percentage)
     else:
         labels = [f'Файл #{i+1}: {size:.1f} байт ({pct:.2f}%)' 
@@ -346,24 +507,40 @@ def plot_file_size_statistics(input_list, title="Статистика розмі
     
     return fig
 
-def analyze_file_sizes(input_list):
+def analyze_file_sizes(input_list, workers=None):
     """
     Комплексний аналіз розмірів файлів: обчислює статистики, 
     виводить на екран і створює візуалізації.
     
     Args:
         input_list (list): Список розмірів файлів у байтах
+        workers (int): Кількість потоків (за замовчуванням - кількість ядер)
+        
+    Returns:
+        tuple: (статистичний_словник, matplotlib_фігура)
+    """
+    values, counts = fh.compress_sizes(input_list, workers)
+    return analyze_weighted_file_sizes(values, counts, workers)
+
+def analyze_weighted_file_sizes(values, counts, workers=None):
+    """
+    Комплексний аналіз для стиснутого представлення (унікальні розміри, кількості).
+    
+    Args:
+        values (np.ndarray): Відсортовані унікальні розміри файлів у байтах
+        counts (np.ndarray): Кількість файлів кожного розміру
+        workers (int): Кількість потоків (за замовчуванням - кількість ядер)
         
     Returns:
         tuple: (статистичний_словник, matplotlib_фігура)
     """
     # Обчислюємо статистичні показники
-    stats = get_file_statistics(input_list)
+    stats = get_weighted_file_statistics(values, counts, workers)
     
     # Виводимо результати
     print_file_statistics(stats)
     
     # Створюємо візуалізації
-    fig = plot_file_size_statistics(input_list)
+    fig = plot_weighted_file_size_statistics(values, counts)
     
     return stats, fig
@@ -0,0 +1,310 @@
+import argparse
+import os
+import queue
+import sys
+import tempfile
+import threading
+
+import numpy as np
+
+from categories_diagram import CATEGORY_BORDERS, get_category_indices
+from external_sort import DEFAULT_MEMORY_BUDGET, ITEM_SIZE, merge_sorted_runs, write_sorted_run
+from size_age import SizeAgeStage, print_size_age_matrix
+
+DEFAULT_CHUNK_SIZE = 4 * 1024 * 1024  # байтів за одне читання
+QUEUE_DEPTH = 8  # скільки розібраних частин може чекати на обробку
+
+# Формати вхідних даних:
+#   find - find -printf '%s\t%p\n' (розмір, табуляція, шлях)
+#   du   - du -ab (розмір, табуляція, шлях); рядки каталогів з їх сумарним обсягом відкидаються
+#   csv  - path,size (як file_size_sys.csv)
+#   find-times - find -printf '%s\t%T@\t%A@\t%p\n' (розмір, mtime, atime, шлях)
+#   csv-times  - path,mtime,atime,size (scanner.py --times)
+FORMATS = ('find', 'du', 'csv', 'find-times', 'csv-times')
+TIMED_FORMATS = ('find-times', 'csv-times')
+
+
+def detect_format(sample: bytes) -> tuple[str, bytes]:
+    """
+    Визначає формат і роздільник записів за початком потоку.
+
+    Returns:
+        tuple: (формат, роздільник записів - b'\\n' або b'\\0')
+    """
+    separator = b'\0' if b'\0' in sample else b'\n'
+    first_record = sample.split(separator, 1)[0]
+    if b'\t' in first_record and first_record.split(b'\t', 1)[0].strip().isdigit():
+        fields = first_record.split(b'\t', 3)
+        if len(fields) == 4 and all(_is_number(field) for field in fields[1:3]):
+            return 'find-times', separator
+        # find і du -ab за записом не розрізнити, але обидва розбирає DuRecordParser
+        return 'find', separator
+    if first_record.rstrip(b'\r').endswith(b'mtime,atime,size'):
+        return 'csv-times', separator
+    return 'csv', separator
+
+
+def _is_number(field: bytes) -> bool:
+    try:
+        float(field)
+        return True
+    except ValueError:
+        return False
+
+
+def _is_parent(path: bytes, child: bytes) -> bool:
+    prefix = path if path.endswith(b'/') else path + b'/'
+    return child.startswith(prefix)
+
+
+class DuRecordParser:
+    """
+    Розбір записів "розмір<TAB>шлях" (find -printf і du -ab). Крім файлів du друкує
+    кожен каталог із сумарним обсягом його вмісту, і вже після цього вмісту. Тому запис,
+    шлях якого є батьківським для попереднього, - це каталог, і він відкидається.
+    find ніколи не друкує батьківський каталог після вкладеного запису, тож для нього
+    нічого не змінюється. Попередній шлях зберігається між частинами потоку.
+    Порожні каталоги du від файлів не відрізнити.
+    """
+
+    def __init__(self):
+        self.previous_path = None
+
+    def __call__(self, records: list[bytes], fmt: str = 'du') -> np.ndarray:
+        sizes = []
+        for record in records:
+            fields = record.split(b'\t', 1)
+            if len(fields) < 2:
+                continue
+            path = fields[1]
+            is_directory = self.previous_path is not None and _is_parent(path, self.previous_path)
+            self.previous_path = path
+            if is_directory:
+                continue
+            try:
+                sizes.append(int(fields[0]))
+            except ValueError:
+                continue
+        return np.array(sizes, dtype=np.int64)
+
+
+def parse_records(records: list[bytes], fmt: str) -> np.ndarray:
+    """
+    Повертає розміри з записів; записи, які не вдалося розібрати, пропускаються.
+    Для find і du використовуйте DuRecordParser - йому потрібен попередній запис.
+    """
+    if fmt in ('find', 'du'):
+        return DuRecordParser()(records)
+    sizes = []
+    for record in records:
+        if fmt == 'csv':
+            field = record.rsplit(b',', 1)[-1]
+        else:
+            field = record.split(b'\t', 1)[0]
+        try:
+            sizes.append(int(field))
+        except ValueError:
+            continue
+    return np.array(sizes, dtype=np.int64)
+
+
+def parse_timed_records(records: list[bytes], fmt: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Повертає (розміри, mtime, atime) з записів формату find-times або csv-times"""
+    sizes, mtimes, atimes = [], [], []
+    for record in records:
+        if fmt == 'csv-times':
+            fields = record.rsplit(b',', 3)
+            fields = fields[3:] + fields[1:3]
+        else:
+            fields = record.split(b'\t', 3)
+        try:
+            size, mtime, atime = int(fields[0]), float(fields[1]), float(fields[2])
+        except (ValueError, IndexError):
+            continue
+        sizes.append(size)
+        mtimes.append(mtime)
+        atimes.append(atime)
+    return np.array(sizes, dtype=np.int64), np.array(mtimes), np.array(atimes)
+
+
+def _parse_stream(stream, fmt: str, separator: bytes, first_chunk: bytes, chunk_size: int, output: queue.Queue):
+    """Фоновий потік: читає великі блоки, ділить їх на записи і передає масиви розмірів (і часів)"""
+    if fmt in TIMED_FORMATS:
+        parse = parse_timed_records
+    elif fmt in ('find', 'du'):
+        parse = DuRecordParser()
+    else:
+        parse = parse_records
+    try:
+        remainder = b''
+        chunk = first_chunk
+        while chunk:
+            records = (remainder + chunk).split(separator)
+            remainder = records.pop()
+            output.put(parse(records, fmt))
+            chunk = stream.read(chunk_size)
+        if remainder:
+            output.put(parse([remainder], fmt))
+    except BaseException as error:
+        output.put(error)
+    finally:
+        output.put(None)
+
+
+class SizeCountsStage:
+    """Потоково накопичує стиснуте представлення (унікальні розміри, кількості)"""
+
+    def __init__(self):
+        self.values = np.empty(0, dtype=np.int64)
+        self.counts = np.empty(0, dtype=np.int64)
+        self._pending = []
+        self._pending_length = 0
+
+    def consume(self, sizes: np.ndarray):
+        values, counts = np.unique(sizes, return_counts=True)
+        self._pending.append((values, counts))
+        self._pending_length += len(values)
+        # Зливаємо накопичене, коли воно порівнялося з уже злитим - амортизовано O(m) на запис
+        if self._pending_length >= max(len(self.values), 1 << 16):
+            self._merge()
+
+    def _merge(self):
+        if not self._pending:
+            return
+        values = np.concatenate([self.values] + [part[0] for part in self._pending])
+        counts = np.concatenate([self.counts] + [part[1] for part in self._pending])
+        self.values, inverse = np.unique(values, return_inverse=True)
+        self.counts = np.bincount(inverse, weights=counts).astype(np.int64)
+        self._pending, self._pending_length = [], 0
+
+    def finish(self) -> tuple[np.ndarray, np.ndarray]:
+        self._merge()
+        return self.values, self.counts
+
+
+class CategoryStage:
+    """Потокова категоризація за межами з categories_diagram.CATEGORY_BORDERS"""
+
+    def __init__(self):
+        self.counts = np.zeros(len(CATEGORY_BORDERS), dtype=np.int64)
+        self.bytes = np.zeros(len(CATEGORY_BORDERS), dtype=np.int64)
+
+    def consume(self, sizes: np.ndarray):
+        categories = get_category_indices(sizes)
+        self.counts += np.bincount(categories, minlength=len(CATEGORY_BORDERS))
+        np.add.at(self.bytes, categories, sizes)
+
+    def finish(self) -> dict:
+        return {name: (int(count), int(size)) for (name, _, _), count, size
+                in zip(CATEGORY_BORDERS, self.counts, self.bytes)}
+
+
+class SortedRunStage:
+    """Скидає розміри на диск відсортованими частинами і наприкінці зливає їх в один файл int64"""
+
+    def __init__(self, output_filename: str, memory_budget: int = DEFAULT_MEMORY_BUDGET):
+        self.output_filename = output_filename
+        self.memory_budget = memory_budget
+        self._run_dir = tempfile.TemporaryDirectory(dir=os.path.dirname(os.path.abspath(output_filename)),
+                                                    prefix="size_runs_")
+        self._limit = max(1024, memory_budget // (2 * ITEM_SIZE))
+        self._buffer = []
+        self._buffer_length = 0
+        self._runs = []
+
+    def consume(self, sizes: np.ndarray):
+        self._buffer.append(sizes)
+        self._buffer_length += len(sizes)
+        if self._buffer_length >= self._limit:
+            self._spill()
+
+    def _spill(self):
+        if self._buffer_length == 0:
+            return
+        run_filename = os.path.join(self._run_dir.name, f"run_{len(self._runs):05d}.bin")
+        write_sorted_run(np.concatenate(self._buffer), run_filename)
+        self._runs.append(run_filename)
+        self._buffer, self._buffer_length = [], 0
+
+    def finish(self) -> str:
+        self._spill()
+        merge_sorted_runs(self._runs, self.output_filename, self.memory_budget)
+        self._run_dir.cleanup()
+        return self.output_filename
+
+
+def ingest(stream, fmt: str = 'auto', stages: dict = None, chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """
+    Потоково читає список розмірів з бінарного потоку (stdin, pipe, файл). Розбір іде
+    у фоновому потоці великими блоками, а етапи обробки працюють паралельно з ним,
+    тож аналіз починається, поки виробник даних (find, du) ще працює.
+
+    Args:
+        stream: Бінарний потік (наприклад, sys.stdin.buffer)
+        fmt (str): 'auto' або один з FORMATS; для NUL-розділених записів роздільник визначається сам
+        stages (dict): Етапи обробки з методами consume(sizes) і finish(); етапи з
+                       consume_timed(sizes, mtimes, atimes) (SizeAgeStage) потребують формату з часами.
+                       За замовчуванням - SizeCountsStage і CategoryStage
+        chunk_size (int): Розмір блоку читання
+
+    Returns:
+        dict: Результати finish() кожного етапу за тими ж ключами
+    """
+    if stages is None:
+        stages = {"size_counts": SizeCountsStage(), "categories": CategoryStage()}
+
+    first_chunk = stream.read(chunk_size)
+    detected_fmt, separator = detect_format(first_chunk[:64 * 1024])
+    fmt = detected_fmt if fmt == 'auto' else fmt
+    if fmt not in TIMED_FORMATS and any(hasattr(stage, 'consume_timed') for stage in stages.values()):
+        raise ValueError(f"Формат {fmt} не містить mtime/atime; потрібен один з {TIMED_FORMATS}")
+
+    parsed = queue.Queue(maxsize=QUEUE_DEPTH)
+    parser = threading.Thread(target=_parse_stream, args=(stream, fmt, separator, first_chunk, chunk_size, parsed),
+                              daemon=True)
+    parser.start()
+
+    while True:
+        item = parsed.get()
+        if item is None:
+            break
+        if isinstance(item, BaseException):
+            raise item
+        sizes, times = (item[0], item[1:]) if isinstance(item, tuple) else (item, None)
+        if len(sizes) > 0:
+            for stage in stages.values():
+                if hasattr(stage, 'consume_timed'):
+                    stage.consume_timed(sizes, *times)
+                else:
+                    stage.consume(sizes)
+    parser.join()
+
+    return {name: stage.finish() for name, stage in stages.items()}
+
+
+if __name__ == "__main__":
+    import stats
+
+    parser = argparse.ArgumentParser(
+        description="Потоковий аналіз розмірів з stdin: find -printf '%s\\t%p\\n', du -ab, CSV або NUL-розділені записи")
+    parser.add_argument('--format', choices=('auto',) + FORMATS, default='auto')
+    parser.add_argument('--sorted-output', default=None, help="Куди записати відсортовані розміри int64")
+    parser.add_argument('--age', action='store_true', help="Матриці розмір × вік (формати find-times, csv-times)")
+    args = parser.parse_args()
+
+    stages = {"size_counts": SizeCountsStage(), "categories": CategoryStage()}
+    if args.sorted_output:
+        stages["sorted"] = SortedRunStage(args.sorted_output)
+    if args.age:
+        stages["size_age"] = SizeAgeStage()
+    results = ingest(sys.stdin.buffer, args.format, stages)
+
+    stats.print_file_statistics(stats.get_weighted_file_statistics(*results["size_counts"]))
+    print("\nРозподіл файлів за категоріями розміру:")
+    for category, (count, size) in results["categories"].items():
+        print(f"{category}: {count} файлів, {size} байт")
+    if args.age:
+        for (kind, axis), matrix in results["size_age"].items():
+            if axis == 'categories':
+                print(f"\nРозмір × вік ({kind}), кількість файлів:")
+                print_size_age_matrix(matrix, 'counts')
@@ -0,0 +1,16 @@
+import numpy as np
+
+import file_helper as fh
+
+
+def test_count_sorted_chunks_merges_groups_across_chunks():
+    rng = np.random.default_rng(0)
+    sizes = np.sort(rng.integers(0, 20, 1000))
+    # Блоки різної довжини, зокрема порожні, щоб групи перетинали кілька меж
+    borders = np.sort(rng.integers(0, len(sizes), 40))
+    chunks = np.split(sizes, borders)
+    values, counts = fh.count_sorted_chunks(chunks)
+    expected_values, expected_counts = np.unique(sizes, return_counts=True)
+    assert values.tolist() == expected_values.tolist()
+    assert counts.tolist() == expected_counts.tolist()
+    assert fh.count_sorted_chunks([])[0].dtype == np.int64
@@ -0,0 +1,40 @@
+import time
+
+import numpy as np
+
+import file_helper as fh
+from range_index import RangeIndex, to_int_bounds
+
+
+def test_bounds_are_searched_as_int64():
+    bounds = to_int_bounds([5.5, 1024.0, -np.inf, np.inf, 2.0 ** 70])
+    assert bounds.dtype == np.int64
+    assert bounds.tolist() == [6, 1024, np.iinfo(np.int64).min] + [np.iinfo(np.int64).max] * 2
+
+
+def test_query_does_not_scan_values():
+    index = RangeIndex.from_sizes(np.arange(0, 40_000_000, 2, dtype=np.int64), fence_step=4096)
+    index.query([5], [100])
+    started = time.perf_counter()
+    for _ in range(100):
+        index.query([5.5], [np.inf])
+    # Повне перетворення 20M розмірів у float64 займає десятки мілісекунд на запит
+    assert (time.perf_counter() - started) / 100 < 0.005
+
+
+def test_query_matches_brute_force(tmp_path):
+    rng = np.random.default_rng(0)
+    sizes = rng.integers(0, 5000, 20000)
+    index = RangeIndex.from_sizes(sizes, fence_step=64)
+    index.save(str(tmp_path))
+    loaded = RangeIndex.load(str(tmp_path))
+    assert np.array_equal(loaded.fences, index.fences)
+
+    lower = np.array([0, 10.5, 100, 4999, -np.inf])
+    upper = np.array([1, 2000, 100, np.inf, 3.2])
+    expected_counts = [np.sum((sizes >= a) & (sizes < b)) for a, b in zip(lower, upper)]
+    expected_bytes = [sizes[(sizes >= a) & (sizes < b)].sum() for a, b in zip(lower, upper)]
+    for candidate in (index, loaded):
+        result = candidate.query(lower, upper)
+        assert result["counts"].tolist() == expected_counts
+        assert result["bytes"].tolist() == expected_bytes
@@ -0,0 +1,11 @@
+import numpy as np
+
+import stats
+
+
+def test_gini_with_billions_of_files_per_size():
+    values = np.array([1, 4096])
+    counts = np.array([4_000_000_000, 4_000_000_000])
+    gini = stats.get_weighted_file_statistics(values, counts)["gini_coefficient"]
+    # Дві рівні групи: середня абсолютна різниця 4095 / 2, середнє 4097 / 2
+    assert np.isclose(gini, 4095 / (2 * 4097))
@@ -0,0 +1,22 @@
+import io
+
+import numpy as np
+
+from stream_ingest import ingest
+
+
+def _get_totals(data: bytes, chunk_size: int = 1 << 16) -> tuple[int, int]:
+    values, counts = ingest(io.BytesIO(data), chunk_size=chunk_size)["size_counts"]
+    return int(counts.sum()), int(np.sum(values * counts))
+
+
+def test_du_directory_after_first_sample_is_dropped():
+    # Перший каталог du друкує лише після 10 000 файлів - далеко за межами зразка формату
+    lines = [f"100\t./big/file{index:05d}\n" for index in range(10_000)]
+    lines += ["1000000\t./big\n", "5\t./small\n", "1000005\t.\n"]
+    assert _get_totals("".join(lines).encode()) == (10_001, 1_000_005)
+
+
+def test_find_output_is_unchanged():
+    lines = ["4096\t./dir\n", "10\t./dir/a\n", "20\t./dir/b\n", "30\t./c\n"]
+    assert _get_totals("".join(lines).encode(), chunk_size=8) == (4, 4156)
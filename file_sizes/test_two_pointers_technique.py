@@ -0,0 +1,92 @@
+import random
+
+import numpy as np
+
+import file_helper as fh
+import two_pointers_technique as tp
+
+
+def _get_brute_force_min_range(sizes, majority_coeff):
+    """Перебір усіх інтервалів: найменший обсяг, серед рівних - найменший лівий кінець"""
+    preffix_sum = tp.create_preffix_sum(sizes)
+    best = None
+    for l in range(1, len(sizes) + 1):
+        for r in range(l, len(sizes) + 1):
+            if tp.get_relative_sum(preffix_sum, l, r) >= majority_coeff:
+                space = tp.get_sum(preffix_sum, l, r)
+                if best is None or space < best[0]:
+                    best = (space, l, r)
+                break
+    return best
+
+
+def _get_brute_force_min_count(sizes, majority_coeff):
+    """Перебір усіх інтервалів: найменша кількість файлів, серед рівних - найменший лівий кінець"""
+    preffix_sum = tp.create_preffix_sum(sizes)
+    best = None
+    for l in range(1, len(sizes) + 1):
+        for r in range(l, len(sizes) + 1):
+            if tp.get_relative_sum(preffix_sum, l, r) >= majority_coeff:
+                if best is None or r - l + 1 < best[1] - best[0] + 1:
+                    best = (l, r)
+                break
+    return best
+
+
+def test_min_count_keeps_leftmost_interval():
+    sizes = [5, 5, 5, 5, 13, 13, 13, 13, 13]
+    assert tp.get_weighted_interval_with_min_count(*fh.compress_sizes(sizes), 0.5) == \
+        tp.get_interval_with_min_count(tp.create_preffix_sum(sizes), 0.5) == (4, 7)
+
+
+def test_min_count_matches_brute_force():
+    rng = random.Random(1)
+    for _ in range(3000):
+        pool = [rng.choice([0, 1, 2, 3, 5, 8, 13, 100, 4096, rng.randint(0, 60)]) for _ in range(rng.randint(1, 6))]
+        sizes = sorted(rng.choice(pool) for _ in range(rng.randint(1, 25)))
+        majority_coeff = rng.choice([0.1, 0.5, 0.8, 0.9, 0.99, rng.random()])
+        if sum(sizes) == 0:
+            continue
+        best = _get_brute_force_min_count(sizes, majority_coeff)
+        if best is None:
+            continue
+        assert tp.get_weighted_interval_with_min_count(*fh.compress_sizes(sizes), majority_coeff) == best, \
+            (sizes, majority_coeff)
+        assert tp.get_interval_with_min_count(tp.create_preffix_sum(sizes), majority_coeff) == best
+
+
+def test_min_range_starts_inside_group():
+    sizes = [1, 2, 2, 3, 3, 3, 5, 8, 4096, 4096]
+    assert tp.get_weighted_interval_with_min_range(*fh.compress_sizes(sizes), 0.5) == \
+        tp.get_interval_with_min_range(tp.create_preffix_sum(sizes), 0.5) == (6, 9)
+
+
+def test_min_range_matches_brute_force():
+    rng = random.Random(0)
+    for _ in range(3000):
+        pool = [rng.choice([0, 1, 2, 3, 5, 8, 13, 100, 4096, rng.randint(0, 60)]) for _ in range(rng.randint(1, 6))]
+        sizes = sorted(rng.choice(pool) for _ in range(rng.randint(1, 25)))
+        majority_coeff = rng.choice([0.1, 0.5, 0.8, 0.9, 0.99, rng.random()])
+        if sum(sizes) == 0:
+            continue
+        best = _get_brute_force_min_range(sizes, majority_coeff)
+        if best is None:
+            continue
+
+        l, r = tp.get_weighted_interval_with_min_range(*fh.compress_sizes(sizes), majority_coeff)
+        preffix_sum = tp.create_preffix_sum(sizes)
+        assert (tp.get_sum(preffix_sum, l, r), l, r) == best, (sizes, majority_coeff)
+        # Базова версія не оновлює відповідь, якщо найкращий інтервал займає весь простір
+        if best[0] < preffix_sum[-1]:
+            assert tp.get_interval_with_min_range(preffix_sum, majority_coeff) == (l, r)
+
+
+def test_min_range_matches_baseline_on_large_groups():
+    rng = np.random.default_rng(3)
+    for _ in range(20):
+        values = np.unique(rng.integers(1, 5000, rng.integers(2, 30)))
+        counts = rng.integers(1, 3000, len(values))
+        majority_coeff = float(rng.choice([0.37, 0.5, 0.8, 0.9]))
+        preffix_sum = tp.create_preffix_sum(np.repeat(values, counts).tolist())
+        assert tp.get_weighted_interval_with_min_range(values, counts, majority_coeff) == \
+            tp.get_interval_with_min_range(preffix_sum, majority_coeff)
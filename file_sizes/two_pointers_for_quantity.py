@@ -1,4 +1,6 @@
 import file_helper as fh
+import numpy as np
+import two_pointers_technique as tp
 
 def get_sum(preffix_sum: list[int], l: int, r: int) -> int:
     l = max(l, 1)
@@ -47,30 +49,58 @@ def get_interval_with_min_borders(input_list: list[int], majority_coeff = 0.9):
 
     return (res_l, res_r)
 
+def get_weighted_interval_with_min_borders(values, counts, majority_coeff = 0.9):
+    """
+    Аналог get_interval_with_min_borders для стиснутого представлення (унікальні розміри, кількості).
+    Інтервал завжди вигідно починати з початку групи однакових розмірів, тому перебираємо
+    лише групи: для кожної шукаємо першу групу, на якій набирається потрібна частка файлів.
+
+    Returns:
+        tuple: (l, r) - межі інтервалу у нумерації відсортованих файлів з 1
+    """
+    count_preffix, _ = tp.create_weighted_preffix_sums(values, counts)
+    total_count = int(count_preffix[-1])
+    required = min(max(1, int(np.ceil(majority_coeff * total_count))), total_count)
+
+    left_group = np.arange(len(values))
+    right_group = np.searchsorted(count_preffix, count_preffix[:-1] + required, side='left') - 1
+    valid = right_group < len(values)
+    left_group, right_group = left_group[valid], right_group[valid]
+
+    best = int(np.argmin(values[right_group] - values[left_group]))
+    l = int(count_preffix[left_group[best]]) + 1
+    return (l, l + required - 1)
+
 
 def get_graph_values_for_min_borders(input_list: list[int], majority_coeff = 0.9):
-    input_list.sort()
+    values, counts = fh.compress_sizes(input_list)
+    return get_weighted_graph_values_for_min_borders(values, counts, majority_coeff)
 
-    preffix_sum = create_preffix_sum(input_list)
+def get_weighted_graph_values_for_min_borders(values, counts, majority_coeff = 0.9):
+    count_preffix, bytes_preffix = tp.create_weighted_preffix_sums(values, counts)
+    total_count = int(count_preffix[-1])
 
-    l, r = get_interval_with_min_borders(input_list, majority_coeff)
+    l, r = get_weighted_interval_with_min_borders(values, counts, majority_coeff)
     result = []
     if (l > 1):
-        result.append(get_relative_sum(preffix_sum, 1, l-1))
-    result.append(get_relative_sum(preffix_sum, l, r))
-    if (r < len(preffix_sum) - 1):
-        result.append(get_relative_sum(preffix_sum, r + 1, len(preffix_sum) - 1))
+        result.append(tp.get_weighted_relative_sum(values, count_preffix, bytes_preffix, 1, l-1))
+    result.append(tp.get_weighted_relative_sum(values, count_preffix, bytes_preffix, l, r))
+    if (r < total_count):
+        result.append(tp.get_weighted_relative_sum(values, count_preffix, bytes_preffix, r + 1, total_count))
 
-    return result, input_list[l-1], input_list[r-1]
+    return result, tp.get_size_at(values, count_preffix, l), tp.get_size_at(values, count_preffix, r)
 
 def get_answer(input_list: list[int], majority_coeff = 0.9):
-    input_list.sort()
-
-    l, r = get_interval_with_min_borders(input_list, majority_coeff)
-    return f'Переважна більшість файлів ({get_file_percentage(len(input_list), l, r)*100}%) має розміри у діапазоні від {input_list[l-1]} до {input_list[r-1]}'
+    values, counts = fh.compress_sizes(input_list)
+    return get_weighted_answer(values, counts, majority_coeff)
 
+def get_weighted_answer(values, counts, majority_coeff = 0.9):
+    count_preffix, _ = tp.create_weighted_preffix_sums(values, counts)
 
-input_list = fh.get_sizes(fh.STATS_FILENAME)
-print(get_answer(input_list))
+    l, r = get_weighted_interval_with_min_borders(values, counts, majority_coeff)
+    return f'Переважна більшість файлів ({get_file_percentage(int(count_preffix[-1]), l, r)*100}%) має розміри у діапазоні від {tp.get_size_at(values, count_preffix, l)} до {tp.get_size_at(values, count_preffix, r)}'
 
 
+if __name__ == "__main__":
+    values, counts = fh.get_size_counts(fh.STATS_FILENAME)
+    print(get_weighted_answer(values, counts))
@@ -1,4 +1,8 @@
+import math
+from bisect import bisect_left
+
 import file_helper as fh
+import numpy as np
 
 def get_sum(preffix_sum: list[int], l: int, r: int) -> int:
     l = max(l, 1)
@@ -64,46 +68,258 @@ def get_interval_with_min_range(preffix_sum: list[int], majority_coeff = 0.9):
     return (res_l, res_r)
 
 
+def create_weighted_preffix_sums(values, counts):
+    """
+    Префіксні суми для стиснутого представлення (унікальні розміри, кількості):
+    кількість файлів і сумарний обсяг до початку кожної групи однакових розмірів.
+    """
+    count_preffix = np.concatenate(([0], np.cumsum(counts))).astype(np.int64)
+    bytes_preffix = np.concatenate(([0], np.cumsum(values * counts))).astype(np.int64)
+    return count_preffix, bytes_preffix
+
+def get_weighted_sum(values, count_preffix, bytes_preffix, position):
+    """Сумарний обсяг перших position файлів (position може бути масивом)"""
+    group = np.searchsorted(count_preffix, position, side='right') - 1
+    group = np.minimum(group, len(values) - 1)
+    return bytes_preffix[group] + (position - count_preffix[group]) * values[group]
+
+def _get_required_space(total: int, majority_coeff) -> int:
+    """
+    Найменший обсяг space, для якого space / total >= majority_coeff - та сама умова,
+    що й у get_relative_sum, але в цілих числах.
+    """
+    if total <= 0:
+        return 0
+    required = max(math.ceil(majority_coeff * total), 0)
+    while required > 0 and (required - 1) / total >= majority_coeff:
+        required -= 1
+    while required / total < majority_coeff:
+        required += 1
+    return required
+
+def _get_weighted_candidates(values, count_preffix, bytes_preffix, majority_coeff):
+    """
+    Кандидати-інтервали [l, r] (у нумерації файлів з 1), що займають не менше majority_coeff
+    простору. Серед інтервалів з мінімальною кількістю файлів завжди є такий, що починається
+    на початку групи однакових розмірів або закінчується в її кінці, тому достатньо
+    перебрати лише межі груп - O(m log m) замість O(n).
+    """
+    groups = len(values)
+    required = _get_required_space(int(bytes_preffix[-1]), majority_coeff)
+
+    # Лівий кінець на початку групи: шукаємо мінімальний правий кінець
+    left_start = count_preffix[:-1]
+    target = bytes_preffix[:-1] + required
+    right_group = np.searchsorted(bytes_preffix, target, side='left') - 1
+    valid = right_group < groups
+    left_start, target, right_group = left_start[valid], target[valid], np.maximum(right_group[valid], 0)
+    need = np.maximum(target - bytes_preffix[right_group], 0)
+    right_end = count_preffix[right_group] + -(-need // np.maximum(values[right_group], 1))
+    left_a = left_start + 1
+    right_a = np.maximum(right_end, left_a)
+
+    # Правий кінець у кінці групи: шукаємо максимальний лівий кінець
+    right_end = count_preffix[1:]
+    limit = bytes_preffix[1:] - required
+    valid = limit >= 0
+    right_end, limit = right_end[valid], limit[valid]
+    left_group = np.searchsorted(bytes_preffix, limit, side='right') - 1
+    inside = left_group < groups
+    safe_group = np.minimum(left_group, groups - 1)
+    left_end = np.where(
+        inside,
+        np.minimum(count_preffix[safe_group] + (limit - bytes_preffix[safe_group]) // np.maximum(values[safe_group], 1),
+                   count_preffix[safe_group + 1]),
+        count_preffix[-1]
+    )
+    left_b = np.minimum(left_end + 1, right_end)
+    right_b = right_end
+
+    return np.concatenate((left_a, left_b)), np.concatenate((right_a, right_b))
+
+def get_weighted_interval_with_min_count(values, counts, majority_coeff = 0.9):
+    """
+    Аналог get_interval_with_min_count для стиснутого представлення.
+    Як і в get_interval_with_min_count, серед інтервалів з мінімальною кількістю
+    файлів повертається той, що починається найлівіше.
+
+    Returns:
+        tuple: (l, r) - межі інтервалу у нумерації відсортованих файлів з 1
+    """
+    count_preffix, bytes_preffix = create_weighted_preffix_sums(values, counts)
+    left, right = _get_weighted_candidates(values, count_preffix, bytes_preffix, majority_coeff)
+    if len(left) == 0:
+        return (1, int(count_preffix[-1]))
+
+    min_count = int(np.min(right - left)) + 1
+    required = _get_required_space(int(bytes_preffix[-1]), majority_coeff)
+    # Розміри відсортовані, тож обсяг вікна з min_count файлів не спадає зі зсувом вправо:
+    # найменший l, з якого вікно ще достатнє, знаходимо бінарним пошуком
+    low, high = 1, int(count_preffix[-1]) - min_count + 1
+    while low < high:
+        middle = (low + high) // 2
+        window = (get_weighted_sum(values, count_preffix, bytes_preffix, middle + min_count - 1)
+                  - get_weighted_sum(values, count_preffix, bytes_preffix, middle - 1))
+        if window >= required:
+            high = middle
+        else:
+            low = middle + 1
+    return (low, low + min_count - 1)
+
+def _get_min_linear_mod(a: int, b: int, m: int, length: int) -> tuple[int, int]:
+    """
+    Мінімум (a - t * b) mod m для t = 0 .. length - 1 і найменше t, на якому він досягається.
+    Значення повторюються з періодом m / gcd(b, m): якщо діапазон покриває період,
+    мінімум дорівнює a mod gcd і t знаходиться через обернений елемент, інакше - перебір блоками.
+    """
+    divisor = math.gcd(b, m)
+    period = m // divisor
+    if length >= period:
+        remainder = a % divisor
+        if period == 1:
+            return remainder, 0
+        return remainder, (a - remainder) // divisor * pow(b // divisor, -1, period) % period
+    if length <= 64:
+        overshoots = [(a - t * b) % m for t in range(length)]
+        best_value = min(overshoots)
+        return best_value, overshoots.index(best_value)
+
+    best_value, best_t = m, 0
+    block = 1 << 16
+    steps = np.arange(block, dtype=np.int64)
+    for start in range(0, length, block):
+        # Початок блоку рахуємо у цілих Python, всередині блоку t * b вміщується в int64
+        base = (a - start * b) % m
+        overshoot = (base - steps[:min(block, length - start)] * b) % m
+        index = int(np.argmin(overshoot))
+        if overshoot[index] < best_value:
+            best_value, best_t = int(overshoot[index]), start + index
+        if best_value == 0:
+            break
+    return best_value, best_t
+
+def _get_min_right_end(values, count_preffix, bytes_preffix, required: int, l: int) -> int:
+    """Найменший правий кінець r >= l, для якого інтервал [l, r] займає не менше required байтів"""
+    target = int(get_weighted_sum(values, count_preffix, bytes_preffix, l - 1)) + required
+    group = max(int(np.searchsorted(bytes_preffix, target, side='left')) - 1, 0)
+    need = max(target - int(bytes_preffix[group]), 0)
+    right = int(count_preffix[group]) + (-(-need // int(values[group])) if values[group] > 0 else 0)
+    return max(right, l)
+
+def get_weighted_interval_with_min_range(values, counts, majority_coeff = 0.9):
+    """
+    Аналог get_interval_with_min_range для стиснутого представлення (точний).
+
+    Для фіксованого лівого кінця l найкращий правий кінець - мінімальний, і обсяг інтервалу
+    дорівнює required + перевищення. Коли l зсувається на j файлів усередині групи розміру v,
+    ціль зсувається на j * v, тож для кожної пари (група лівого кінця, група правого кінця
+    розміру w) перевищення - це (a - j * v) mod w, мінімум якого шукає _get_min_linear_mod.
+    Таких пар O(m), бо цілі для сусідніх груп лівого кінця утворюють суміжні відрізки.
+
+    Returns:
+        tuple: (l, r) - межі інтервалу у нумерації відсортованих файлів з 1
+    """
+    count_preffix, bytes_preffix = create_weighted_preffix_sums(values, counts)
+    total = int(bytes_preffix[-1])
+    required = _get_required_space(total, majority_coeff)
+    if len(values) == 0 or required > total:
+        return (1, int(count_preffix[-1]))
+
+    # Лівий кінець на початку кожної групи - векторно
+    left, right = _get_weighted_candidates(values, count_preffix, bytes_preffix, majority_coeff)
+    space = (get_weighted_sum(values, count_preffix, bytes_preffix, right)
+             - get_weighted_sum(values, count_preffix, bytes_preffix, left - 1))
+    first = np.lexsort((left, space))[0]
+    best_space, best_left = int(space[first]), int(left[first])
+
+    # Лівий кінець усередині групи (j >= 1 файлів від її початку); для нульових розмірів
+    # зсув не змінює обсягу, тож такі групи вже враховані початком групи.
+    # Скалярна робота на кожну пару груп, тож звичайні списки швидші за NumPy
+    value_list, count_list, count_starts, byte_starts = (values.tolist(), counts.tolist(),
+                                                         count_preffix.tolist(), bytes_preffix.tolist())
+    for group in np.flatnonzero((counts > 1) & (values > 0)).tolist():
+        # Кращого обсягу не буде, а лівіші кінці вже не трапляться
+        if best_space == required and count_starts[group] + 2 > best_left:
+            break
+        size = value_list[group]
+        start_target = byte_starts[group] + required
+        last_j = min(count_list[group] - 1, (total - start_target) // size)
+        j = 1
+        while j <= last_j:
+            target = start_target + j * size
+            end_group = bisect_left(byte_starts, target) - 1
+            end_size = value_list[end_group]
+            end_j = min(last_j, (byte_starts[end_group + 1] - start_target) // size)
+            overshoot, offset = _get_min_linear_mod(byte_starts[end_group] - target, size % end_size,
+                                                    end_size, end_j - j + 1)
+            candidate_left = count_starts[group] + j + offset + 1
+            if (required + overshoot, candidate_left) < (best_space, best_left):
+                best_space, best_left = required + overshoot, candidate_left
+            j = end_j + 1
+
+    return (best_left, _get_min_right_end(values, count_preffix, bytes_preffix, required, best_left))
+
+def get_weighted_relative_sum(values, count_preffix, bytes_preffix, l: int, r: int) -> float:
+    l = max(l, 1)
+    r = min(r, int(count_preffix[-1]))
+    if r < l:
+        return 0.0
+    return (get_weighted_sum(values, count_preffix, bytes_preffix, r)
+            - get_weighted_sum(values, count_preffix, bytes_preffix, l - 1)) / bytes_preffix[-1]
+
+def get_size_at(values, count_preffix, position: int) -> int:
+    """Розмір файлу з номером position (з 1) у відсортованому порядку"""
+    return int(values[np.searchsorted(count_preffix, position, side='left') - 1])
+
+
 def get_graph_values_for_min_range(input_list: list[int], majority_coeff = 0.9):
-    input_list.sort()
+    values, counts = fh.compress_sizes(input_list)
+    return get_weighted_graph_values_for_min_range(values, counts, majority_coeff)
 
-    preffix_sum = create_preffix_sum(input_list)
+def get_weighted_graph_values_for_min_range(values, counts, majority_coeff = 0.9):
+    count_preffix, bytes_preffix = create_weighted_preffix_sums(values, counts)
+    total_count = int(count_preffix[-1])
 
-    l, r = get_interval_with_min_range(preffix_sum, majority_coeff)
+    l, r = get_weighted_interval_with_min_range(values, counts, majority_coeff)
     result = []
     if (l > 1):
-        result.append(get_relative_sum(preffix_sum, 1, l-1))
-    result.append(get_relative_sum(preffix_sum, l, r))
-    if (r < len(preffix_sum) - 1):
-        result.append(get_relative_sum(preffix_sum, r + 1, len(preffix_sum) - 1))
+        result.append(get_weighted_relative_sum(values, count_preffix, bytes_preffix, 1, l-1))
+    result.append(get_weighted_relative_sum(values, count_preffix, bytes_preffix, l, r))
+    if (r < total_count):
+        result.append(get_weighted_relative_sum(values, count_preffix, bytes_preffix, r + 1, total_count))
 
-    return result, input_list[l-1], input_list[r-1]
+    return result, get_size_at(values, count_preffix, l), get_size_at(values, count_preffix, r)
 
 
 def get_graph_values_for_min_count(input_list: list[int], majority_coeff = 0.9):
-    input_list.sort()
+    values, counts = fh.compress_sizes(input_list)
+    return get_weighted_graph_values_for_min_count(values, counts, majority_coeff)
 
-    preffix_sum = create_preffix_sum(input_list)
+def get_weighted_graph_values_for_min_count(values, counts, majority_coeff = 0.9):
+    count_preffix, bytes_preffix = create_weighted_preffix_sums(values, counts)
+    total_count = int(count_preffix[-1])
 
-    l, r = get_interval_with_min_count(preffix_sum, majority_coeff)
+    l, r = get_weighted_interval_with_min_count(values, counts, majority_coeff)
 
     result = []
     relative_space = []
     if (l > 1):
         result.append(l-1)
-        relative_space.append(get_relative_sum(preffix_sum, 1, l-1))
+        relative_space.append(get_weighted_relative_sum(values, count_preffix, bytes_preffix, 1, l-1))
     result.append(r - l + 1)
-    relative_space.append(get_relative_sum(preffix_sum, l, r))
-    if (r < len(preffix_sum) - 1):
-        result.append(len(preffix_sum) - r)
-        relative_space.append(get_relative_sum(preffix_sum, r+1, len(preffix_sum) - 1))
+    relative_space.append(get_weighted_relative_sum(values, count_preffix, bytes_preffix, l, r))
+    if (r < total_count):
+        result.append(total_count + 1 - r)
+        relative_space.append(get_weighted_relative_sum(values, count_preffix, bytes_preffix, r+1, total_count))
 
     return result, l, r, relative_space
 
 def get_answer(input_list: list[int], majority_coeff = 0.9):
-    input_list.sort()
+    values, counts = fh.compress_sizes(input_list)
+    return get_weighted_answer(values, counts, majority_coeff)
 
-    preffix_sum = create_preffix_sum(input_list)
+def get_weighted_answer(values, counts, majority_coeff = 0.9):
+    count_preffix, bytes_preffix = create_weighted_preffix_sums(values, counts)
 
-    l, r = get_interval_with_min_count(preffix_sum, majority_coeff)
-    return f'Переважна більшість файлів ({get_relative_sum(preffix_sum, l, r)*100}%) має розміри у діапазоні від {input_list[l-1]} до {input_list[r-1]}'
\ No newline at end of file
+    l, r = get_weighted_interval_with_min_count(values, counts, majority_coeff)
+    return f'Переважна більшість файлів ({get_weighted_relative_sum(values, count_preffix, bytes_preffix, l, r)*100}%) має розміри у діапазоні від {get_size_at(values, count_preffix, l)} до {get_size_at(values, count_preffix, r)}'